@@ -1,26 +1,47 @@
 """Application configuration and settings management."""
 
-from typing import Any
+from functools import cached_property
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import PostgresDsn, RedisDsn, SecretStr, field_validator
+from pydantic import PostgresDsn, RedisDsn, SecretStr, computed_field, field_validator
 
 
 class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 25
+    DATABASE_MAX_OVERFLOW: int = 25
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds
+    # Off by default: a SELECT 1 on every checkout, and asyncpg already drops connections it finds closed
+    DATABASE_POOL_PRE_PING: bool = False
+    # Set when DATABASE_URL points at an external pooler such as PgBouncer
+    DATABASE_EXTERNAL_POOLER: bool = False
 
     REDIS_URL: RedisDsn
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_POOL_TIMEOUT: int = 2  # seconds to wait for a free pooled connection
 
     # Environment Settings
     ENVIRONMENT: str = "development"
 
     # Authentication Settings
-    JWT_SECRET_KEY: SecretStr
+    JWT_SECRET_KEY: SecretStr  # HMAC secret, or PEM private key for asymmetric algorithms
+    JWT_PUBLIC_KEY: SecretStr | None = None  # PEM public key for asymmetric algorithms
     JWT_ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 5
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Failed logins allowed per email address and client before further attempts are rejected,
+    # and a much higher ceiling per email address across all clients
+    LOGIN_MAX_FAILED_ATTEMPTS: int = 5
+    LOGIN_MAX_FAILED_ATTEMPTS_PER_EMAIL: int = 100
+    LOGIN_LOCKOUT_SECONDS: int = 900
+
+    # Addresses of reverse proxies whose X-Forwarded-For header is trusted (comma-separated)
+    TRUSTED_PROXIES: tuple[str, ...] | str = ()
 
     # CORS Settings
-    CORS_ORIGINS: Any = []
+    # Unions with str let comma-separated env values through to the validators below
+    CORS_ORIGINS: tuple[str, ...] | str = ("*",)
 
     # Email Settings
     # SMTP_HOST: str
@@ -35,8 +56,10 @@ class Settings(BaseSettings):
 
     # File Upload Settings
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5 MB
-    ALLOWED_IMAGE_MIMES: Any = ["image/jpeg", "image/png"]
+    ALLOWED_IMAGE_MIMES: tuple[str, ...] | str = ("image/jpeg", "image/png")
     PROFILE_UPLOAD_BUCKET: str = "profile"
+    # Parse every uploaded image with Pillow, on top of the libmagic header check
+    STRICT_IMAGE_VALIDATION: bool = False
 
     # MinIO Settings
     MINIO_PORT: int = 9000
@@ -58,29 +81,64 @@ class Settings(BaseSettings):
     # Logging Settings
     LOG_LEVEL: str = "INFO"
 
+    @field_validator("DATABASE_URL", mode="before")
+    @classmethod
+    def use_asyncpg_driver(cls, v):
+        # The engine is async-only: make sure plain or psycopg2 URLs use the asyncpg driver
+        if isinstance(v, str):
+            for scheme in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+                if v.startswith(scheme):
+                    return "postgresql+asyncpg://" + v[len(scheme):]
+        return v
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
-    def assemble_cors_origins(cls, v) -> list[str] | str:
+    def assemble_cors_origins(cls, v) -> tuple[str, ...]:
         if isinstance(v, str) and not v.startswith("["):
             # Split by comma and strip whitespace
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
-            return v
+            return tuple(i.strip() for i in v.split(","))
+        elif isinstance(v, (list, tuple)):
+            return tuple(v)
+        raise ValueError(v)
+
+    @field_validator("TRUSTED_PROXIES", mode="before")
+    @classmethod
+    def assemble_trusted_proxies(cls, v) -> tuple[str, ...]:
+        if isinstance(v, str):
+            return tuple(i.strip() for i in v.split(",") if i.strip())
+        elif isinstance(v, (list, tuple)):
+            return tuple(v)
         raise ValueError(v)
 
     @field_validator("ALLOWED_IMAGE_MIMES", mode="before")
     @classmethod
-    def assemble_allowed_image_mimes(cls, v):
+    def assemble_allowed_image_mimes(cls, v) -> tuple[str, ...]:
         if isinstance(v, str):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, list):
-            return v
+            return tuple(i.strip() for i in v.split(","))
+        elif isinstance(v, (list, tuple)):
+            return tuple(v)
         raise ValueError(v)
 
+    # Token lifetimes in seconds, computed once since settings are frozen
+    @computed_field  # type: ignore[misc]
+    @cached_property
+    def ACCESS_TOKEN_EXPIRE_SECONDS(self) -> int:
+        return self.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    @computed_field  # type: ignore[misc]
+    @cached_property
+    def REFRESH_TOKEN_EXPIRE_SECONDS(self) -> int:
+        return self.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
-        extra='ignore')
+        extra='ignore',
+        frozen=True)
 
 
 settings = Settings()  # type: ignore
+
+# Set view of the allowed MIME types, for O(1) membership checks on uploads
+ALLOWED_IMAGE_MIMES_SET: frozenset[str] = frozenset(settings.ALLOWED_IMAGE_MIMES)
+TRUSTED_PROXIES_SET: frozenset[str] = frozenset(settings.TRUSTED_PROXIES)
@@ -0,0 +1,67 @@
+"""
+CORS Middleware
+
+Specialized CORS handling for deployments that allow any origin. Browsers do
+not accept a literal wildcard for credentialed requests (the Authorization
+header and the refresh token cookie), so the request's origin and requested
+headers are echoed back; every other header is constant and built once.
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_ALLOW_CREDENTIALS = (b"access-control-allow-credentials", b"true")
+_VARY_ORIGIN = (b"vary", b"Origin")
+
+_PREFLIGHT_HEADERS = [
+    _ALLOW_CREDENTIALS,
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"content-length", b"0"),
+    _VARY_ORIGIN,
+]
+
+
+class WildcardCORSMiddleware:
+    """ASGI middleware that allows credentialed cross-origin requests from any origin.
+
+    Requests without an Origin header (same-origin and server-to-server traffic)
+    are passed through untouched. Preflight requests are answered directly, and
+    other cross-origin responses get the request's origin as Access-Control-Allow-Origin.
+
+    Attributes:
+        app (ASGIApp): The wrapped ASGI application
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        origin = headers.get(b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allow_origin = (b"access-control-allow-origin", origin)
+
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in headers:
+            preflight_headers = [allow_origin, *_PREFLIGHT_HEADERS]
+            requested_headers = headers.get(b"access-control-request-headers")
+            if requested_headers:
+                preflight_headers.append(
+                    (b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": preflight_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []),
+                                      allow_origin, _ALLOW_CREDENTIALS, _VARY_ORIGIN]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
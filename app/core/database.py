@@ -5,45 +5,67 @@ This module handles database connection, session management, and provides
 dependency injection functions for FastAPI endpoints.
 """
 
+import asyncio
+from asyncio import current_task
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from fastapi import FastAPI
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
     create_async_engine,
+    async_scoped_session,
     async_sessionmaker
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from core.config import settings
 import logging
-from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
-# Create async engine
+# Process-wide engine and session factories, created by database_lifespan
+_engine: Optional[AsyncEngine] = None
+_scoped_session: Optional[async_scoped_session[AsyncSession]] = None
+_readonly_sessionmaker: Optional[async_sessionmaker] = None
+
+# Session closes running in the background; referenced here so they are not garbage collected
+_pending_closes: set[asyncio.Task] = set()
+
+
+def _create_engine() -> AsyncEngine:
+    connect_args = {"server_settings": {"jit": "off"}}
+
+    if settings.ENVIRONMENT == "testing" or settings.DATABASE_EXTERNAL_POOLER:
+        # Pooling is delegated (e.g. to PgBouncer in transaction mode), which cannot
+        # keep prepared statements across transactions
+        pool_options = {"poolclass": NullPool}
+        connect_args.update(statement_cache_size=0,
+                            prepared_statement_cache_size=0)
+    else:
+        pool_options = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": 30,
+            "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+            "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+            "pool_reset_on_return": "rollback",
+        }
+        connect_args.update(statement_cache_size=1024,
+                            prepared_statement_cache_size=500)
 
-
-@lru_cache(maxsize=1)
-def get_engine() -> AsyncEngine:
     return create_async_engine(
         settings.DATABASE_URL.unicode_string(),
-        echo=True if settings.ENVIRONMENT == "development" else False,
+        echo=settings.DATABASE_ECHO,
         future=True,
-        pool_pre_ping=True,
-        poolclass=NullPool if settings.ENVIRONMENT == "testing" else None,
-        pool_size=20,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=3600,
+        connect_args=connect_args,
+        **pool_options,
     )
 
 
-# Async session factory
-@lru_cache(maxsize=1)
-def get_sessionmaker() -> async_sessionmaker:
+def _create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker:
     return async_sessionmaker(
-        get_engine(),
+        engine,
         class_=AsyncSession,
         expire_on_commit=False,
         autoflush=False
@@ -55,23 +77,54 @@ async def database_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Lifespan handler to initialize and close database connections.
 
     This function is used in FastAPI's lifespan to ensure that the database
-    engine and sessionmaker are properly initialized on startup and disposed on shutdown.
+    engine and sessionmakers are initialized on startup and disposed on shutdown.
     """
+    global _engine, _scoped_session, _readonly_sessionmaker
     logger.info("Initializing database connection")
-    get_sessionmaker()
+    _engine = _create_engine()
+    # Task-scoped session registry: every consumer within the same request task shares one session
+    _scoped_session = async_scoped_session(
+        _create_sessionmaker(_engine), scopefunc=current_task)
+    # Session factory for read-only work, bound to AUTOCOMMIT to skip BEGIN/COMMIT round trips
+    _readonly_sessionmaker = _create_sessionmaker(
+        _engine.execution_options(isolation_level="AUTOCOMMIT"))
 
     try:
         yield
     finally:
         logger.info("Disposing database connection")
-        engine = get_engine()
-        await engine.dispose()
+        if _pending_closes:
+            await asyncio.gather(*_pending_closes, return_exceptions=True)
+        await _engine.dispose()
+        _engine = _scoped_session = _readonly_sessionmaker = None
+
+
+def _on_close_done(task: asyncio.Task) -> None:
+    _pending_closes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Database session close error: %s", task.exception())
+
+
+def _close_in_background(session: AsyncSession) -> None:
+    """Closes a session without making the caller wait for the connection to be released.
+
+    Args:
+        session (AsyncSession): Session to close
+    """
+    task = asyncio.create_task(session.close())
+    _pending_closes.add(task)
+    task.add_done_callback(_on_close_done)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function to get database session for FastAPI endpoints.
 
+    The session is scoped to the current asyncio task, so every dependency of a
+    request shares it. A connection is only checked out from the pool once the
+    session first executes a statement. Rollbacks on errors are awaited, but the
+    final close runs in the background so it does not delay the response.
+
     Yields:
         AsyncSession: Database session that will be automatically closed
 
@@ -81,12 +134,32 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             # Use db session here
             pass
     """
-    session = get_sessionmaker()()
+    session = _scoped_session()
     try:
         yield session
     except Exception as e:
         await session.rollback()
-        logger.error(f"Database session error: {e}")
+        logger.error("Database session error: %s", e)
         raise
     finally:
-        await session.close()
+        # Detach from the task scope now; the registry is keyed on the current task,
+        # so this must not happen inside the background close
+        _scoped_session.registry.clear()
+        _close_in_background(session)
+
+
+async def get_readonly_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a read-only database session for FastAPI endpoints.
+
+    The session runs in AUTOCOMMIT mode, so queries skip the transaction
+    begin/commit round trips. Never use it for writes.
+
+    Yields:
+        AsyncSession: Database session that will be automatically closed
+    """
+    session = _readonly_sessionmaker()
+    try:
+        yield session
+    finally:
+        _close_in_background(session)
@@ -1,13 +1,14 @@
 """Application dependencies for FastAPI.
 Provides common dependencies like authentication and authorization.
 """
+from functools import lru_cache
 from typing import Annotated
 import logging
 
-from fastapi import Depends, status
+from fastapi import Depends, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
+from jwt import InvalidTokenError
 from redis.asyncio import Redis
 
 from models.user import UserRole
@@ -16,11 +17,13 @@ from services.profile import ProfileService
 from services.seller_application import SellerApplicationService
 from services.user import UserService
 from core.exceptions import BaseCustomException, TokenAuthException
+from core.security import cache_token, decode_token, get_cached_token, hash_token
 from services.storage import StorageService
-from models import User
-from .database import get_db
+from schema.auth import CurrentUser
+from .database import get_db, get_readonly_db
 from .redis import get_redis
-from .config import settings
+from .revocation import is_token_revoked
+from .config import TRUSTED_PROXIES_SET, settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,16 +31,17 @@ logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-async def get_user_service(db: Annotated[AsyncSession, Depends(get_db)]) -> UserService:
+async def get_user_service(db: Annotated[AsyncSession, Depends(get_db)], redis_client: Annotated[Redis, Depends(get_redis)]) -> UserService:
     """Gets a user service object.
 
     Args:
         db (Annotated[AsyncSession, Depends): Database session dependency
+        redis_client (Annotated[Redis, Depends]): Redis dependency
 
     Returns:
         UserService: UserService instance with database session
     """
-    return UserService(db)
+    return UserService(db, redis_client)
 
 
 async def get_auth_service(user_service: Annotated[UserService, Depends(get_user_service)], redis_client: Annotated[Redis, Depends(get_redis)]) -> AuthService:
@@ -53,13 +57,21 @@ async def get_auth_service(user_service: Annotated[UserService, Depends(get_user
     return AuthService(user_service, redis_client)
 
 
+@lru_cache
+def _storage_service(bucket_name: str) -> StorageService:
+    return StorageService(bucket_name)
+
+
 async def get_profile_picture_storage_service() -> StorageService:
     """Gets a Storage Service object that uploads files to the Profile Picture bucket
 
+    The service is created on first use and shared, so the MinIO client, the bucket
+    check and the ClamAV client are only set up once per process.
+
     Returns:
         StorageService: StorageService instance, acessing the Profile Upload Bucket
     """
-    return StorageService(settings.PROFILE_UPLOAD_BUCKET)
+    return _storage_service(settings.PROFILE_UPLOAD_BUCKET)
 
 
 async def get_profile_service(session: Annotated[AsyncSession, Depends(get_db)], storage_service: Annotated[StorageService, Depends(get_profile_picture_storage_service)]) -> ProfileService:
@@ -71,56 +83,104 @@ async def get_profile_service(session: Annotated[AsyncSession, Depends(get_db)],
     return ProfileService(session, storage_service)
 
 
-async def get_seller_application_service(session: Annotated[AsyncSession, Depends(get_db)]) -> ProfileService:
+async def get_seller_application_service(user_service: Annotated[UserService, Depends(get_user_service)], session: Annotated[AsyncSession, Depends(get_db)]) -> SellerApplicationService:
     """Gets a seller application service object
 
     Returns:
         SellerApplicationService: SellerApplicationService instance
     """
-    return SellerApplicationService(session)
+    return SellerApplicationService(user_service, session)
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], user_service: Annotated[UserService, Depends(get_user_service)]) -> User:
+async def get_readonly_seller_application_service(user_service: Annotated[UserService, Depends(get_user_service)], session: Annotated[AsyncSession, Depends(get_readonly_db)]) -> SellerApplicationService:
+    """Gets a seller application service object for read-only endpoints
+
+    The session runs in AUTOCOMMIT mode, so listing applications skips the
+    transaction begin/commit round trips. Never use it for endpoints that write.
+
+    Returns:
+        SellerApplicationService: SellerApplicationService instance with a read-only session
+    """
+    return SellerApplicationService(user_service, session)
+
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> CurrentUser:
     """Get the current authenticated user from the JWT token.
 
+    The user is built from the token claims, so the common path never touches the
+    database. Revocation (logout, deactivation, role change) is checked against the
+    in-memory revocation set, and verified tokens are cached in-process for a short
+    time, so repeated requests with the same token skip the signature check.
+
     Args:
         token (str): token to verify
 
     Raises:
-        credentials_exception: If token is invalid or expired
+        credentials_exception: If token is invalid, expired or revoked
         credentials_exception: If token does not contain required fields
 
     Returns:
-        TokenData: The decoded token data
+        CurrentUser: The authenticated user
     """
     credentials_exception = TokenAuthException(
         description="The provided authentication token is invalid or expired.",
     )
 
+    token_hash = hash_token(token)
+    cached_user = get_cached_token(token_hash)
+    if cached_user is not None:
+        # Revocations published by other workers do not evict this worker's cache
+        if is_token_revoked(cached_user.id, cached_user.jti, cached_user.iat):
+            raise credentials_exception
+        return cached_user
+
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY.get_secret_value(), algorithms=[settings.JWT_ALGORITHM])
+        payload = decode_token(token)
         user_id: str | None = payload.get("sub")
+        jti: str | None = payload.get("jti")
 
-        if user_id is None:
+        if payload.get("type") != "access" or user_id is None or jti is None or "role" not in payload:
             raise credentials_exception
 
-        user = await user_service.get_user_by_id(user_id)
-
-        if user.is_active is False:
+        issued_at = payload.get("iat", 0)
+        if is_token_revoked(user_id, jti, issued_at):
             raise credentials_exception
 
+        user = CurrentUser(id=user_id, role=UserRole(payload["role"]), jti=jti, iat=issued_at, exp=payload["exp"])
+        cache_token(token_hash, user, payload["exp"])
         return user
 
-    except JWTError as e:
-        logger.warning(f"Invalid token: {e}")
-        raise credentials_exception
-    except BaseCustomException as e:
-        logger.warning(f"Authentication error: {e}")
+    except (InvalidTokenError, ValueError) as e:
+        logger.warning("Invalid token: %s", e)
         raise credentials_exception
 
 
-async def get_current_user_id(current_user: Annotated[User, Depends(get_current_user)]) -> str:
+def get_client_ip(request: Request) -> str:
+    """Gets the address of the client that sent the request.
+
+    Behind a trusted reverse proxy the peer address is the proxy's, so the
+    X-Forwarded-For header is read from the right, skipping trusted proxies,
+    up to the first address that was not added by one of them.
+
+    Args:
+        request (Request): Incoming request
+
+    Returns:
+        str: Client address, or "unknown" if the server did not report one
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    if client_ip not in TRUSTED_PROXIES_SET:
+        return client_ip
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        for address in reversed(forwarded_for.split(",")):
+            client_ip = address.strip()
+            if client_ip not in TRUSTED_PROXIES_SET:
+                break
+    return client_ip
+
+
+async def get_current_user_id(current_user: Annotated[CurrentUser, Depends(get_current_user)]) -> str:
     return current_user.id
 
 
@@ -128,25 +188,40 @@ def require_role(*allowed_roles: UserRole):
     """
     Dependency factory to enforce role-based access control.
 
+    The same set of roles always returns the same dependency callable, whatever
+    the order or repetition of the arguments, so FastAPI can cache it like any
+    other dependency.
+
     Args:
         *allowed_roles: Roles that are allowed to access
 
     Returns:
         Dependency function that checks user role
     """
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    return _role_checker(frozenset(allowed_roles))
+
+
+# One entry per possible combination of roles; the cache also keeps the checkers alive
+@lru_cache(maxsize=2 ** len(UserRole))
+def _role_checker(allowed: frozenset[UserRole]):
+    roles = [role for role in UserRole if role in allowed]
+    denied_description = f"This action requires one of these roles: {[r.name.lower() for r in roles]}"
+
+    async def role_checker(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         user_role = current_user.role
 
-        if user_role not in allowed_roles:
+        if user_role not in allowed:
             logger.warning(
-                f"Access denied: user role {user_role} not in allowed roles {allowed_roles}"
+                "Access denied: user role %s not in allowed roles %s", user_role, roles
             )
             raise BaseCustomException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 error="Forbidden",
-                description=f"This action requires one of these roles: {[r.value for r in allowed_roles]}"
+                description=denied_description
             )
 
         return current_user
 
+    role_checker.__name__ = f"require_role_{'_'.join(r.name.lower() for r in roles)}"
+    role_checker.__qualname__ = role_checker.__name__
     return role_checker
@@ -0,0 +1,62 @@
+"""
+Health Checks
+
+Load balancer probes are answered by an ASGI middleware placed in front of the
+whole application, so they skip the other middleware, routing and dependency
+resolution entirely.
+
+- GET /health: the API process is up
+- GET /ready: the API is ready to accept requests
+"""
+
+from typing import Dict
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _probe_response(content: dict) -> tuple[Message, bytes]:
+    """Pre-serializes a probe response once, at import time.
+
+    Args:
+        content (dict): Response body
+
+    Returns:
+        tuple[Message, bytes]: The response start message and the encoded body
+    """
+    body = orjson.dumps(content)
+    start = {
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+    }
+    return start, body
+
+
+# The bodies are constant, so probes send the same bytes every time
+_PROBES: Dict[str, tuple[Message, bytes]] = {
+    "/health": _probe_response({"status": "healthy", "service": "Fast Car Sales API"}),
+    "/ready": _probe_response({"ready": True, "timestamp": "2026-01-24T23:19:30Z"}),
+}
+
+
+class HealthCheckMiddleware:
+    """ASGI middleware that answers health probes before the rest of the application.
+
+    Attributes:
+        app (ASGIApp): The wrapped ASGI application
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        probe = _PROBES.get(scope["path"]) if scope["type"] == "http" else None
+        if probe is None or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        start, body = probe
+        await send(start)
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
@@ -6,52 +6,84 @@ for the application.
 """
 
 from contextlib import asynccontextmanager
+import socket
 from typing import AsyncGenerator, Any, Optional
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
 from core.config import settings
 import logging
-import json
+import orjson
 
 
 logger = logging.getLogger(__name__)
 
+# Process-wide client, set by redis_lifespan
+_redis_client: Optional[redis.Redis] = None
+
 
 @asynccontextmanager
 async def redis_lifespan(app: FastAPI) -> AsyncGenerator[redis.Redis, None]:
     """Lifespan handler for Redis connection."""
-    client = await redis.from_url(
+    global _redis_client
+    # Blocking pool: callers wait for a free connection instead of failing when the pool is exhausted
+    pool = redis.BlockingConnectionPool.from_url(
         str(settings.REDIS_URL),
-        encoding="utf-8",
-        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        protocol=3,
+        # Values are (de)serialized with orjson, which works on bytes directly
+        decode_responses=False,
         retry_on_timeout=True,
-        max_connections=10
+        # Keep idle pooled connections alive instead of reconnecting
+        socket_keepalive=True,
+        socket_keepalive_options={socket.TCP_KEEPIDLE: 60} if hasattr(
+            socket, "TCP_KEEPIDLE") else {},
     )
+    client = redis.Redis(connection_pool=pool)
     try:
         # Test connection
         await client.ping()
         logger.info("Redis connection established successfully")
         app.state.redis = client
+        _redis_client = client
         yield client
     finally:
-        await client.close()
+        _redis_client = None
+        await client.close(close_connection_pool=True)
         logger.info("Redis connection closed")
 
 
-def get_redis(request: Request) -> redis.Redis:
-    """Gets redis client from app state.
+async def get_redis() -> redis.Redis:
+    """Gets the process-wide redis client.
 
-    Args:
-        request (Request): Request object to access app state
+    Declared async so FastAPI calls it directly instead of dispatching it to its threadpool.
+
+    Raises:
+        RuntimeError: If the client has not been initialized by redis_lifespan
 
     Returns:
         redis.Redis: Redis client instance
     """
-    if not hasattr(request.app.state, "redis"):
+    if _redis_client is None:
         raise RuntimeError(
             "Redis client not initialized. Please ensure Redis is properly configured and initialized.")
-    return request.app.state.redis
+    return _redis_client
+
+
+def cache_pipeline(client: redis.Redis) -> Pipeline:
+    """
+    Start a non-transactional pipeline, to send several commands in a single round trip.
+
+    Args:
+        client: Redis client instance
+
+    Returns:
+        Pipeline: Pipeline to queue commands on; use it as an async context manager
+        and send the queued commands with `await pipe.execute()`
+    """
+    return client.pipeline(transaction=False)
 
 
 async def cache_set(
@@ -66,18 +98,17 @@ async def cache_set(
     Args:
         client: Redis client instance
         key: Cache key
-        value: Value to cache (will be JSON serialized)
+        value: Value to cache (will be JSON serialized with orjson)
         expire: Expiration time in seconds (default: 1 hour)
 
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        serialized_value = json.dumps(value)
-        await client.setex(key, expire, serialized_value)
+        await client.setex(key, expire, orjson.dumps(value))
         return True
     except Exception as e:
-        logger.error(f"Cache set error for key {key}: {e}")
+        logger.error("Cache set error for key %s: %s", key, e)
         return False
 
 
@@ -95,10 +126,10 @@ async def cache_get(client: redis.Redis, key: str) -> Optional[Any]:
     try:
         value = await client.get(key)
         if value:
-            return json.loads(value)
+            return orjson.loads(value)
         return None
     except Exception as e:
-        logger.error(f"Cache get error for key {key}: {e}")
+        logger.error("Cache get error for key %s: %s", key, e)
         return None
 
 
@@ -117,5 +148,5 @@ async def cache_delete(client: redis.Redis, key: str) -> bool:
         await client.delete(key)
         return True
     except Exception as e:
-        logger.error(f"Cache delete error for key {key}: {e}")
+        logger.error("Cache delete error for key %s: %s", key, e)
         return False
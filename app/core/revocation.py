@@ -0,0 +1,184 @@
+"""
+Access Token Revocation
+
+Access tokens are verified without a database lookup, so revocations (logout,
+deactivation, role changes) must be checked on every authenticated request.
+To keep that check free of network I/O, revocations are kept in two layers:
+
+- Redis holds the source of truth: a sorted set of revoked token IDs (scored by
+  token expiration) and a sorted set of users whose earlier tokens are revoked
+  (scored by revocation time). Every revocation is also published on a stream.
+- Every worker keeps an in-memory copy, loaded at startup and kept up to date by
+  a background task that follows the stream.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any, AsyncGenerator, Iterator
+
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+
+from core.config import settings
+from core.redis import cache_pipeline
+
+logger = logging.getLogger(__name__)
+
+REVOKED_TOKENS_KEY = "revoked_access_tokens"
+REVOKED_USERS_KEY = "revoked_access_token_users"
+REVOCATION_EVENTS_KEY = "revoked_access_token_events"
+
+# Events older than this are trimmed from the stream; workers only need recent ones
+_STREAM_MAX_LENGTH = 10_000
+_PRUNE_INTERVAL = 60  # seconds
+
+# In-memory copies: token ID -> expiration, and user ID -> revocation time.
+# Revocation times are whole seconds, like the iat claim they are compared with,
+# so a token issued in the same second as the revocation (e.g. on the next login) stays valid.
+_revoked_tokens: dict[str, float] = {}
+_revoked_users: dict[str, int] = {}
+
+
+def is_token_revoked(user_id: str, jti: str, issued_at: float) -> bool:
+    """Checks whether an access token has been revoked, without any I/O.
+
+    Args:
+        user_id (str): ID of the user the token was issued to
+        jti (str): Unique identifier of the token
+        issued_at (float): Token issue time (Unix timestamp, whole seconds)
+
+    Returns:
+        bool: True if the token was revoked, or was issued before its user's tokens were revoked
+    """
+    if jti in _revoked_tokens:
+        return True
+    revoked_before = _revoked_users.get(user_id)
+    return revoked_before is not None and issued_at < revoked_before
+
+
+def queue_token_revocation(pipe: Pipeline, jti: str, expires_at: float) -> None:
+    """Revokes a single access token as part of a larger pipeline.
+
+    The token is revoked in this worker at once; Redis and the other workers
+    are updated when the caller executes the pipeline.
+
+    Args:
+        pipe (Pipeline): Pipeline to queue the Redis commands on
+        jti (str): Unique identifier of the token
+        expires_at (float): Token expiration (Unix timestamp), after which the entry is pruned
+    """
+    _revoked_tokens[jti] = expires_at
+    pipe.zadd(REVOKED_TOKENS_KEY, {jti: expires_at})
+    pipe.xadd(REVOCATION_EVENTS_KEY, {"kind": "token", "id": jti, "at": expires_at},
+              maxlen=_STREAM_MAX_LENGTH, approximate=True)
+
+
+async def revoke_user_tokens(client: redis.Redis, user_id: str) -> None:
+    """Revokes every access token issued to a user until now.
+
+    Args:
+        client (redis.Redis): Redis client instance
+        user_id (str): ID of the user whose tokens are revoked
+    """
+    now = int(time.time())
+    _revoked_users[user_id] = now
+    async with cache_pipeline(client) as pipe:
+        pipe.zadd(REVOKED_USERS_KEY, {user_id: now})
+        pipe.xadd(REVOCATION_EVENTS_KEY, {"kind": "user", "id": user_id, "at": now},
+                  maxlen=_STREAM_MAX_LENGTH, approximate=True)
+        await pipe.execute()
+
+
+def _apply_event(fields: dict[bytes, bytes]) -> None:
+    kind = fields[b"kind"]
+    member = fields[b"id"].decode()
+    at = float(fields[b"at"])
+    if kind == b"token":
+        _revoked_tokens[member] = at
+    elif kind == b"user":
+        _revoked_users[member] = max(int(at), _revoked_users.get(member, 0))
+
+
+async def _load_revocations(client: redis.Redis) -> None:
+    now = time.time()
+    tokens = await client.zrangebyscore(REVOKED_TOKENS_KEY, now, "+inf", withscores=True)
+    users = await client.zrangebyscore(
+        REVOKED_USERS_KEY, now - settings.ACCESS_TOKEN_EXPIRE_SECONDS, "+inf", withscores=True)
+    _revoked_tokens.update((member.decode(), score) for member, score in tokens)
+    _revoked_users.update((member.decode(), int(score)) for member, score in users)
+
+
+def _stream_entries(response: Any) -> Iterator[tuple[bytes, dict[bytes, bytes]]]:
+    """Flattens an XREAD reply into (entry ID, fields) pairs, for both RESP2 and RESP3."""
+    if not response:
+        return
+    # RESP3 maps stream -> [entries], RESP2 returns a list of [stream, entries]
+    if isinstance(response, dict):
+        streams = (entries for stream_entries in response.values() for entries in stream_entries)
+    else:
+        streams = (entries for _, entries in response)
+    for entries in streams:
+        yield from entries
+
+
+async def _follow_events(client: redis.Redis, last_id: bytes | str) -> None:
+    while True:
+        try:
+            response = await client.xread({REVOCATION_EVENTS_KEY: last_id}, block=5000)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Revocation stream read error: %s", e)
+            await asyncio.sleep(1)
+            continue
+        for entry_id, fields in _stream_entries(response):
+            # Skip past a malformed event instead of re-reading it forever
+            last_id = entry_id
+            try:
+                _apply_event(fields)
+            except Exception as e:
+                logger.error("Invalid revocation event %s: %s", entry_id, e)
+
+
+async def _prune_expired(client: redis.Redis) -> None:
+    while True:
+        await asyncio.sleep(_PRUNE_INTERVAL)
+        now = time.time()
+        users_cutoff = now - settings.ACCESS_TOKEN_EXPIRE_SECONDS
+        for jti in [jti for jti, expires_at in _revoked_tokens.items() if expires_at < now]:
+            del _revoked_tokens[jti]
+        for user_id in [user_id for user_id, at in _revoked_users.items() if at < users_cutoff]:
+            del _revoked_users[user_id]
+        try:
+            async with cache_pipeline(client) as pipe:
+                pipe.zremrangebyscore(REVOKED_TOKENS_KEY, "-inf", now)
+                pipe.zremrangebyscore(REVOKED_USERS_KEY, "-inf", users_cutoff)
+                await pipe.execute()
+        except Exception as e:
+            logger.error("Revocation prune error: %s", e)
+
+
+@asynccontextmanager
+async def revocation_lifespan(client: redis.Redis) -> AsyncGenerator[None, None]:
+    """Lifespan handler that loads revocations and keeps them in sync while the app runs.
+
+    Args:
+        client (redis.Redis): Redis client instance
+    """
+    # Capture the stream position first, so events published while loading are replayed
+    last_entries = await client.xrevrange(REVOCATION_EVENTS_KEY, count=1)
+    last_id = last_entries[0][0] if last_entries else "0-0"
+    await _load_revocations(client)
+    logger.info("Loaded %d revoked tokens and %d revoked users",
+                len(_revoked_tokens), len(_revoked_users))
+
+    tasks = [asyncio.create_task(_follow_events(client, last_id)),
+             asyncio.create_task(_prune_expired(client))]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
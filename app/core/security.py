@@ -1,96 +1,276 @@
 """Security utility functions."""
+import asyncio
 import bcrypt
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import secrets
+import time
+from datetime import timedelta
+from typing import Any, Optional
 import logging
-from jose import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TLRUCache
+import jwt
+from jwt.algorithms import get_default_algorithms
 
 from core.config import settings
+from models.user import UserRole
 
 logger = logging.getLogger(__name__)
 
+# Materialized once: the keys and algorithm never change for the lifetime of the process.
+# Keys are prepared up front, so asymmetric algorithms parse their PEM keys only once
+# and every call reuses the loaded cryptography key objects.
+_JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+_JWT_ALGORITHM = get_default_algorithms()[settings.JWT_ALGORITHM]
+_JWT_SIGNING_KEY = _JWT_ALGORITHM.prepare_key(settings.JWT_SECRET_KEY.get_secret_value())
+_JWT_VERIFYING_KEY = _JWT_ALGORITHM.prepare_key(settings.JWT_PUBLIC_KEY.get_secret_value()) \
+    if settings.JWT_PUBLIC_KEY is not None else _JWT_SIGNING_KEY
+# Shared codec, so the algorithm objects are built once instead of per call
+_JWT = jwt.PyJWT()
+
+# Argon2id parameters: 3 passes over 12 MiB with 2 lanes
+_PASSWORD_HASHER = PasswordHasher(
+    time_cost=3, memory_cost=12288, parallelism=2, hash_len=32)
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# Dedicated pool for password hashing: argon2-cffi and bcrypt release the GIL while
+# hashing, so threads run in parallel across cores, and hashing bursts cannot starve
+# the default executor used by other blocking calls.
+_HASH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+# Maximum time (in seconds) a verified token stays in the in-process cache
+TOKEN_CACHE_TTL = 30
+
+
+def _token_cache_ttu(_key: bytes, value: tuple[Any, int], now: float) -> float:
+    """Expires cached entries after TOKEN_CACHE_TTL, or earlier if the token itself expires."""
+    return min(now + TOKEN_CACHE_TTL, value[1])
+
+
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=10_000, ttu=_token_cache_ttu, timer=time.time)
+
 
 def hash_password(password: str) -> str:
     """
-    Hash a plaintext password using bcrypt.
+    Hash a plaintext password using Argon2id.
 
     Args:
         password: Plaintext password to hash
 
     Returns:
-        str: Bcrypt hashed password
+        str: PHC-encoded Argon2id hash
     """
-    salt = bcrypt.gensalt(rounds=12)
-    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+    return _PASSWORD_HASHER.hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
     """
     Verify a plaintext password against the stored hash.
 
+    Legacy bcrypt hashes are still accepted, so existing accounts keep working
+    until they are rehashed on their next login.
+
     Args:
         password: Plaintext password to verify
-        hashed: Bcrypt hashed password
+        hashed: Argon2id or legacy bcrypt hashed password
 
     Returns:
         bool: True if password matches, False otherwise
     """
-    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    if hashed.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    try:
+        return _PASSWORD_HASHER.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
-def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
-    """Generates a JWT access token.
+def password_needs_rehash(hashed: str) -> bool:
+    """
+    Check whether a stored hash should be replaced by a new one.
 
     Args:
-        user_id (str): ID of the user
-        expires_delta (Optional[timedelta], optional): Token expiration delta. If None, uses default settings.
+        hashed: Argon2id or legacy bcrypt hashed password
 
     Returns:
-        str: The generated JWT access token.
+        bool: True for legacy bcrypt hashes and Argon2 hashes with outdated parameters
+    """
+    return hashed.startswith(_BCRYPT_PREFIXES) or _PASSWORD_HASHER.check_needs_rehash(hashed)
+
+
+async def ahash_password(password: str) -> str:
+    """
+    Hash a plaintext password without blocking the event loop.
+
+    Args:
+        password: Plaintext password to hash
+
+    Returns:
+        str: PHC-encoded Argon2id hash
+    """
+    return await asyncio.get_running_loop().run_in_executor(_HASH_EXECUTOR, hash_password, password)
+
+
+async def averify_password(password: str, hashed: str) -> bool:
+    """
+    Verify a plaintext password against the stored hash without blocking the event loop.
+
+    Password hashing is CPU-bound by design, so the check runs in a dedicated thread pool.
+
+    Args:
+        password: Plaintext password to verify
+        hashed: Argon2id or legacy bcrypt hashed password
+
+    Returns:
+        bool: True if password matches, False otherwise
     """
-    if expires_delta is None:
-        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return await asyncio.get_running_loop().run_in_executor(_HASH_EXECUTOR, verify_password, password, hashed)
+
 
-    expire = datetime.now(timezone.utc) + expires_delta
+def _make_token(user_id: str, ttl_seconds: int, kind: str, **claims: Any) -> str:
+    """Generates a signed JWT for the given user.
+
+    Args:
+        user_id (str): ID of the user
+        ttl_seconds (int): Token lifetime in seconds
+        kind (str): Token type claim ("access" or "refresh")
+        **claims: Additional claims to embed in the token
+
+    Returns:
+        str: The generated JWT.
+    """
+    now = int(time.time())
 
     to_encode = {
-        "sub": str(user_id),  # Subject (user ID)
-        "exp": expire,        # Expiration time
-        "iat": datetime.now(timezone.utc),  # Issued at
-        "type": "access"
+        "sub": str(user_id),        # Subject (user ID)
+        "exp": now + ttl_seconds,   # Expiration time (Unix timestamp)
+        "iat": now,                 # Issued at (Unix timestamp)
+        "type": kind,
+        **claims
     }
 
-    encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY.get_secret_value(), algorithm=settings.JWT_ALGORITHM)
-    logger.debug(f"Access token created for user {user_id}")
+    encoded_jwt = _JWT.encode(
+        to_encode, _JWT_SIGNING_KEY, algorithm=_JWT_ALGORITHMS[0])
+    logger.debug("%s token created for user %s", kind, user_id)
 
     return encoded_jwt
 
 
-def create_refresh_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(user_id: str, role: UserRole, expires_delta: Optional[timedelta] = None) -> str:
+    """Generates a JWT access token.
+
+    The user's role and a unique token ID (jti) are embedded, so authenticated
+    requests can be served from the claims alone.
+
+    Args:
+        user_id (str): ID of the user
+        role (UserRole): Current role of the user
+        expires_delta (Optional[timedelta], optional): Token expiration delta. If None, uses default settings.
+
+    Returns:
+        str: The generated JWT access token.
+    """
+    ttl_seconds = int(expires_delta.total_seconds()) if expires_delta is not None \
+        else settings.ACCESS_TOKEN_EXPIRE_SECONDS
+    return _make_token(user_id, ttl_seconds, "access", role=int(role), jti=secrets.token_hex(16))
+
+
+def create_refresh_token(user_id: str, jti: str, role: UserRole, expires_delta: Optional[timedelta] = None) -> str:
     """Generates a JWT refresh token.
 
+    The user's role is embedded, so a refresh can issue the next access token
+    without a database lookup. Role changes delete the user's refresh tokens.
+
     Args:
         user_id (str): ID of the user
+        jti (str): Unique identifier of the token, under which it is stored in Redis
+        role (UserRole): Current role of the user
         expires_delta (Optional[timedelta], optional): Token expiration delta. If None, uses default settings.
 
     Returns:
         str: The generated JWT refresh token.
     """
-    if expires_delta is None:
-        expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ttl_seconds = int(expires_delta.total_seconds()) if expires_delta is not None \
+        else settings.REFRESH_TOKEN_EXPIRE_SECONDS
+    return _make_token(user_id, ttl_seconds, "refresh", role=int(role), jti=jti)
 
-    expire = datetime.now(timezone.utc) + expires_delta
 
-    to_encode = {
-        "sub": str(user_id),  # Subject (user ID)
-        "exp": expire,        # Expiration time
-        "iat": datetime.now(timezone.utc),  # Issued at
-        "type": "refresh"
-    }
+def refresh_token_key(user_id: str, jti: str) -> str:
+    """Gets the Redis key marking a refresh token as valid.
 
-    encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY.get_secret_value(), algorithm=settings.JWT_ALGORITHM)
-    logger.debug(f"Refresh token created for user {user_id}")
+    Each token has its own key, expiring with the token, so abandoned sessions
+    clean themselves up. The user ID prefix lets all of a user's tokens be found
+    when the account is deactivated or its role changes.
 
-    return encoded_jwt
+    Args:
+        user_id (str): ID of the user the token was issued to
+        jti (str): Unique identifier of the token
+
+    Returns:
+        str: Redis key of the refresh token
+    """
+    return f"refresh_token:{user_id}:{jti}"
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    """Verifies a JWT signature and expiration, and returns its claims.
+
+    Args:
+        token (str): Encoded JWT
+
+    Raises:
+        jwt.InvalidTokenError: If the token is invalid or expired
+
+    Returns:
+        dict[str, Any]: The decoded token claims
+    """
+    return _JWT.decode(token, _JWT_VERIFYING_KEY, algorithms=_JWT_ALGORITHMS)
+
+
+def hash_token(token: str) -> bytes:
+    """Computes a short fixed-size digest of a raw token, used as a cache key.
+
+    Args:
+        token (str): Raw encoded JWT
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest of the token
+    """
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def get_cached_token(token_hash: bytes) -> Any | None:
+    """Gets the value cached for an already verified token.
+
+    Args:
+        token_hash (bytes): Digest of the token, as returned by hash_token
+
+    Returns:
+        Any | None: The cached value, or None if missing or expired
+    """
+    cached = _token_cache.get(token_hash)
+    return cached[0] if cached is not None else None
+
+
+def cache_token(token_hash: bytes, value: Any, expires_at: int) -> None:
+    """Caches the value resolved for a verified token.
+
+    Args:
+        token_hash (bytes): Digest of the token, as returned by hash_token
+        value (Any): Value to cache (e.g. the authenticated user)
+        expires_at (int): Token expiration as a Unix timestamp, caps the cache lifetime
+    """
+    _token_cache[token_hash] = (value, expires_at)
+
+
+def evict_cached_token(token_hash: bytes) -> None:
+    """Removes a token from the in-process cache.
+
+    Args:
+        token_hash (bytes): Digest of the token, as returned by hash_token
+    """
+    _token_cache.pop(token_hash, None)
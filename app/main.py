@@ -6,19 +6,25 @@ middleware, and route handlers for the P2P car dealership platform.
 """
 
 import logging
-from typing import Dict
+from typing import Callable, Dict
 from contextlib import asynccontextmanager
+from functools import lru_cache
 import os
 
 from fastapi import FastAPI, Request, status
+from fastapi.dependencies import utils as dependency_utils
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 
-from routes import profile, seller_application, user, health, auth
+from routes import profile, seller_application, user, auth
 from core.exceptions import BaseCustomException
 from core.config import settings
+from core.cors import WildcardCORSMiddleware
+from core.health import HealthCheckMiddleware
 from core.database import database_lifespan
 from core.redis import redis_lifespan
+from core.revocation import revocation_lifespan
 
 # Configure logging
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -28,6 +34,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _memoize_introspection(check: Callable[[Callable], bool]) -> Callable[[Callable], bool]:
+    """Wraps a FastAPI callable-inspection helper so each dependency is only inspected once.
+
+    Args:
+        check (Callable[[Callable], bool]): Inspection helper from fastapi.dependencies.utils
+
+    Returns:
+        Callable[[Callable], bool]: Memoized helper, falling back to the original for unhashable callables
+    """
+    cached = lru_cache(maxsize=4096)(check)
+
+    def wrapper(call: Callable) -> bool:
+        try:
+            return cached(call)
+        except TypeError:
+            return check(call)
+
+    return wrapper
+
+
+# FastAPI re-inspects every dependency callable (coroutine/generator checks) on each
+# request while solving dependencies. The answer never changes, so cache it per callable.
+# These helpers are FastAPI internals (tested against the version pinned in requirements.txt),
+# so each one is only patched if it still exists.
+for _check in ("is_coroutine_callable", "is_gen_callable", "is_async_gen_callable"):
+    _helper = getattr(dependency_utils, _check, None)
+    if not callable(_helper):
+        logger.warning(
+            "fastapi.dependencies.utils.%s not found, dependency inspection is not cached", _check)
+        continue
+    setattr(dependency_utils, _check, _memoize_introspection(_helper))
+
 # Initialize FastAPI application
 
 
@@ -36,9 +75,10 @@ async def lifespan(app: FastAPI):
     """Lifespan handler replacing deprecated on_event startup/shutdown."""
     # Startup actions
     logger.info("Starting Fast Car Sales APIapp..")
-    async with redis_lifespan(app):
-        async with database_lifespan(app):
-            yield  # Yield control to the application
+    async with redis_lifespan(app) as redis_client:
+        async with revocation_lifespan(redis_client):
+            async with database_lifespan(app):
+                yield  # Yield control to the application
     logger.info("Application shutdown complete")
 
 
@@ -50,6 +90,9 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # Routes are declared without trailing slashes; answer 404 instead of a 307 round trip
+    redirect_slashes=False,
 )
 
 # Handle custom exceptions
@@ -57,7 +100,7 @@ app = FastAPI(
 
 @app.exception_handler(BaseCustomException)
 async def custom_exception_gandler(request: Request, exc: BaseCustomException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.error,
@@ -66,24 +109,34 @@ async def custom_exception_gandler(request: Request, exc: BaseCustomException):
         headers=exc.headers
     )
 
-# Import routers
 # Configure CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Outermost apart from the health probes, so it runs before the application
+if "*" in settings.CORS_ORIGINS:
+    app.add_middleware(WildcardCORSMiddleware)
+else:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=frozenset(settings.CORS_ORIGINS),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# Health probes are answered before any other middleware
+app.add_middleware(HealthCheckMiddleware)
 
 # Include route routers with prefixes
 app.include_router(auth.router, prefix="/v1")
-app.include_router(health.router, prefix="/v1")
 app.include_router(user.router, prefix="/v1")
 app.include_router(seller_application.router, prefix="/v1")
 app.include_router(profile.router, prefix="/v1")
 
 # Root endpoint
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to Fast Car Sales API",
+    "version": "0.1.1",
+    "docs": "/docs"
+})
 
 
 @app.get(
@@ -94,26 +147,26 @@ app.include_router(profile.router, prefix="/v1")
     summary="Root endpoint",
     description="Returns basic API information"
 )
-async def root() -> Dict[str, str]:
+async def root() -> Response:
     """
     Root endpoint providing API welcome message and version.
 
     Returns:
-        Dict[str, str]: Welcome message and API version
+        Response: Pre-serialized welcome message and API version
     """
-    return {
-        "message": "Welcome to Fast Car Sales API",
-        "version": "0.1.1",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # (Startup/shutdown handled by the lifespan manager above)
 
 
 # Global exception handler
+# The body is constant: exception details are logged, never sent to clients
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+
+
 @app.exception_handler(Exception)
-async def global_exception_handler(request, exc: Exception) -> JSONResponse:
+async def global_exception_handler(request, exc: Exception) -> Response:
     """
     Handle all unhandled exceptions globally.
 
@@ -122,24 +175,29 @@ async def global_exception_handler(request, exc: Exception) -> JSONResponse:
         exc: The exception that was raised
 
     Returns:
-        JSONResponse: Error response with details
+        Response: Generic error response
     """
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "detail": "Internal server error",
-            "message": str(exc)
-        }
+        media_type="application/json"
     )
 
 
 if __name__ == "__main__":
     import uvicorn
+    development = settings.ENVIRONMENT == "development"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        reload=development,
+        # Reload mode only supports a single worker
+        workers=None if development else os.cpu_count(),
+        backlog=4096,
+        timeout_keep_alive=30,
         log_level="info"
     )
@@ -6,10 +6,12 @@ that will be inherited by all database models.
 """
 
 from datetime import datetime
+from enum import IntEnum
 import uuid
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, SmallInteger
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 
 
 class Base(DeclarativeBase):
@@ -22,6 +24,27 @@ class Base(DeclarativeBase):
     pass
 
 
+class IntEnumType(TypeDecorator):
+    """
+    Column type that stores an IntEnum as a SMALLINT.
+
+    Values are written as plain integers and read back as members of the enum.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[IntEnum], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.enum_class(value)
+
+
 class TimestampMixin:
     """
     Mixin that adds timestamp fields to models.
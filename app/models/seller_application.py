@@ -2,7 +2,7 @@
 
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Text
+from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
@@ -56,3 +56,10 @@ class SellerApplication(Base, TimestampMixin, UUIDMixin):
 
     user = relationship("User", foreign_keys=[user_id])
     reviewer = relationship("User", foreign_keys=[reviewed_by])
+
+
+# Serves the pending-applications listing: filters on status and seeks by (created_at, id)
+Index("ix_seller_applications_status_created_at_id",
+      SellerApplication.status,
+      SellerApplication.created_at.desc(),
+      SellerApplication.id.desc())
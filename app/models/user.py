@@ -2,25 +2,27 @@
 User models package
 """
 
-from enum import Enum
-from sqlalchemy import ForeignKey, Enum as SQLEnum
+from enum import IntEnum
+from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import UUID
 
-from models.base import Base, SlugMixin, SoftDeleteMixin, TimestampMixin, UUIDMixin
+from models.base import Base, IntEnumType, SlugMixin, SoftDeleteMixin, TimestampMixin, UUIDMixin
 
 
-class UserRole(Enum):
+class UserRole(IntEnum):
     """
     User role enumeration for role-based access control.
 
+    Stored as a SMALLINT; the API exposes the lowercase member names.
+
     - admin: Full system access, user management
     - seller: Can create and manage car listings
     - buyer: Can browse listings and message sellers
     """
-    ADMIN = "admin"
-    SELLER = "seller"
-    BUYER = "buyer"
+    ADMIN = 1
+    SELLER = 2
+    BUYER = 3
 
 
 class User(Base, TimestampMixin, SoftDeleteMixin, UUIDMixin):
@@ -53,7 +55,7 @@ class User(Base, TimestampMixin, SoftDeleteMixin, UUIDMixin):
     )
 
     role: Mapped[UserRole] = mapped_column(
-        SQLEnum(UserRole),
+        IntEnumType(UserRole),
         default=UserRole.BUYER,
         nullable=False,
         comment="User role for access control"
@@ -81,8 +83,7 @@ class Profile(Base, TimestampMixin, SlugMixin):
     User profile with personal information and profile picture.
 
     Fields:
-        id: Primary key
-        user_id: Reference to User (one-to-one, FK to users.id)
+        user_id: Primary key, shared with the User (one-to-one, FK to users.id)
         slug: Unique username used in public URLs
         full_name: User's full name
         phone: Phone number
@@ -97,12 +98,9 @@ class Profile(Base, TimestampMixin, SlugMixin):
 
     __tablename__ = "profiles"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-
     user_id: Mapped[str] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        unique=True,
+        primary_key=True,
         comment="One-to-one link to User"
     )
 
@@ -4,14 +4,18 @@ Authentication Routes
 Provides endpoints for user registration, login, and token refresh.
 """
 
-from fastapi import APIRouter, Response, status, Depends
+from typing import Optional
 
-from core.dependencies import get_auth_service, get_current_user_id
+from fastapi import APIRouter, Cookie, Response, status, Depends
+from fastapi.responses import ORJSONResponse
+
+from core.dependencies import get_auth_service, get_client_ip, get_current_user, oauth2_scheme
 from core.config import settings
-from schema.auth import UserLogin, TokenResponse
+from schema.auth import CurrentUser, UserLogin, TokenResponse
 from services.auth import AuthService
 
 router = APIRouter(
+    default_response_class=ORJSONResponse,
     prefix="/auth",
     tags=["authentication"],
     responses={
@@ -32,21 +36,23 @@ router = APIRouter(
 async def login(
     response: Response,
     credentials: UserLogin,
+    client_ip: str = Depends(get_client_ip),
     auth_service: AuthService = Depends(get_auth_service),
 ) -> TokenResponse:
     """
     Authenticate user and generate JWT access token and refresh token.
 
     Args:
+        client_ip: Address of the client, from a trusted proxy's X-Forwarded-For when behind one
         credentials: Login credentials (email, password)
         db: Database session
 
     Returns:
         TokenResponse: JWT access token
     """
-    user = await auth_service.authenticate(credentials)
-    access_token = await auth_service.refresh_token(response, user.id)
-    return TokenResponse(access_token=access_token)
+    user = await auth_service.authenticate(credentials, client_ip)
+    access_token = await auth_service.refresh_token(response, user.id, user.role)
+    return TokenResponse(access_token=access_token, expires_in=settings.ACCESS_TOKEN_EXPIRE_SECONDS)
 
 
 @router.post(
@@ -70,32 +76,36 @@ async def refresh_token(
     Returns:
         TokenResponse: New JWT access token
     """
-    user_id = await auth_service.validate_refresh_token(refresh_token)
+    user_id, role = await auth_service.validate_refresh_token(refresh_token)
 
-    access_token = await auth_service.refresh_token(response, user_id)
+    access_token = await auth_service.refresh_token(response, user_id, role)
 
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_SECONDS
     )
 
 
-@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, summary="User logout", description="Logout user by invalidating refresh token")
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, response_class=Response, summary="User logout", description="Logout user by invalidating refresh token")
 async def logout(
-    response: Response,
     auth_service: AuthService = Depends(get_auth_service),
-    user_id: str = Depends(get_current_user_id)
-):
+    current_user: CurrentUser = Depends(get_current_user),
+    access_token: str = Depends(oauth2_scheme),
+    refresh_token: Optional[str] = Cookie(default=None)
+) -> Response:
     """
-    Logout user by invalidating refresh token.
+    Logout user by invalidating refresh token and access token.
 
     Args:
-        response: FastAPI Response object
         auth_service: AuthService instance
-        user_id: ID of the currently authenticated user
+        current_user: The currently authenticated user
+        access_token: Access token used for this request
+        refresh_token: Refresh token cookie, revoked along with the access token
 
     Returns:
-        None
+        Response: Empty response that clears the refresh token cookie
     """
-    await auth_service.logout(response, user_id)
+    response = Response(status_code=status.HTTP_204_NO_CONTENT)
+    await auth_service.logout(response, current_user, access_token, refresh_token)
+    return response
@@ -4,29 +4,31 @@ Profile management API endpoints.
 
 import logging
 from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi.responses import ORJSONResponse
 
 from core.dependencies import get_current_user, get_profile_service
-from models.user import User
+from schema.auth import CurrentUser
 from schema.profile import ProfileUpdateResponse, ProfileUpdate, ProfilePictureResponse
 from services.profile import ProfileService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/profiles",
-                   tags=["profiles"], responses={404: {"description": "Not found"}})
+                   tags=["profiles"], responses={404: {"description": "Not found"}},
+                   default_response_class=ORJSONResponse)
 
 
-@router.put("/", response_model=ProfileUpdateResponse)
+@router.put("", response_model=ProfileUpdateResponse)
 async def update_profile(
     body: ProfileUpdate,
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
     profile_service: ProfileService = Depends(get_profile_service)
 ) -> ProfileUpdateResponse:
     """Updates the profile for the current user
 
     Args:
         body (ProfileUpdate): Request body
-        user (User, optional): Dependency that gets the current user. Defaults to Depends(get_current_user).
+        user (CurrentUser, optional): Dependency that gets the current user. Defaults to Depends(get_current_user).
         profile_service (ProfileService, optional): Dependency that provides a profile service. Defaults to Depends(get_profile_service).
 
     Returns:
@@ -39,14 +41,14 @@ async def update_profile(
 @router.post("/picture", response_model=ProfilePictureResponse)
 async def upload_profile_picture(
     file: UploadFile = File(...),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
     profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Uploads a profile picture for the current user
 
     Args:
         file (UploadFile): The uploaded image file
-        user (User, optional): Dependency that gets the current user. Defaults to Depends(get_current_user).
+        user (CurrentUser, optional): Dependency that gets the current user. Defaults to Depends(get_current_user).
         profile_service (ProfileService, optional): Dependency that provides a profile service. Defaults to Depends(get_profile_service).
 
     Returns:
@@ -1,13 +1,20 @@
 """Seller Application Routes"""
 
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from uuid import UUID
 
-from core.dependencies import get_seller_application_service, require_role
-from models.user import User, UserRole
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+
+from core.dependencies import get_readonly_seller_application_service, get_seller_application_service, require_role
+from core.exceptions import BaseCustomException
+from models.user import UserRole
+from schema.auth import CurrentUser
 from schema.seller_application import SellerApplicationCreate, SellerApplicationResponse, SellerApplicationReview, SellerApplicationShow
 from services.seller_application import SellerApplicationService
 
 router = APIRouter(
+    default_response_class=ORJSONResponse,
     prefix="/seller-applications",
     tags=["seller-applications"],
     responses={
@@ -20,14 +27,14 @@ router = APIRouter(
 
 
 @router.post(
-    "/",
+    "",
     status_code=status.HTTP_201_CREATED,
     response_model=SellerApplicationResponse,
     summary="Submit seller role request",
 )
 async def submit_seller_request(
     request: SellerApplicationCreate,
-    current_user: User = Depends(require_role(UserRole.BUYER)),
+    current_user: CurrentUser = Depends(require_role(UserRole.BUYER)),
     seller_application_service: SellerApplicationService = Depends(
         get_seller_application_service),
 ) -> SellerApplicationResponse:
@@ -35,37 +42,48 @@ async def submit_seller_request(
 
     Args:
         request (SellerApplicationCreate): Request body containing application details
-        current_user (User, optional): Dependency that checks the current user's role and returns their details. Defaults to Depends(require_role(UserRole.BUYER)).
+        current_user (CurrentUser, optional): Dependency that checks the current user's role and returns their details. Defaults to Depends(require_role(UserRole.BUYER)).
         seller_application_service (SellerApplicationService, optional): SellerApplicationService dependency. Defaults to Depends( get_seller_application_service).
 
     Returns:
         SellerApplicationResponse: Response body from the created application
     """
-    request = SellerApplicationCreate(current_user.id, request.details)
-    application = seller_application_service.create_application(request)
+    application = await seller_application_service.create_application(user_id=current_user.id, data=request)
     return application
 
 
 @router.get(
-    "/",
+    "",
     response_model=list[SellerApplicationShow],
     summary="List all seller applications (admin)",
 )
 async def list_seller_applications(
+    limit: int = Query(50, ge=1, le=100),
+    before_created_at: datetime | None = Query(None),
+    before_id: UUID | None = Query(None),
     seller_application_service: SellerApplicationService = Depends(
-        get_seller_application_service),
-    _: User = Depends(require_role(UserRole.ADMIN)),
+        get_readonly_seller_application_service),
+    _: CurrentUser = Depends(require_role(UserRole.ADMIN)),
 ) -> list[SellerApplicationShow]:
-    """Lists seller applications. Can only be accessed by admins.
+    """Lists pending seller applications, newest first. Can only be accessed by admins.
+
+    Pages are requested by passing the creation time and ID of the last application of the previous page.
 
     Args:
-        seller_application_service (SellerApplicationService, optional): SellerApplicationService dependency. Defaults to Depends( get_seller_application_service).
-        _ (User, optional): Dependency that checks the current user's role and returns their details. User details are not needed. Defaults to Depends(require_role(UserRole.ADMIN)).
+        limit (int, optional): Maximum number of applications to return. Defaults to 50.
+        before_created_at (datetime | None, optional): Creation time of the last application of the previous page. Defaults to None.
+        before_id (UUID | None, optional): ID of the last application of the previous page. Defaults to None.
+        seller_application_service (SellerApplicationService, optional): Read-only SellerApplicationService dependency. Defaults to Depends( get_readonly_seller_application_service).
+        _ (CurrentUser, optional): Dependency that checks the current user's role and returns their details. User details are not needed. Defaults to Depends(require_role(UserRole.ADMIN)).
 
     Returns:
         list[SellerApplicationShow]: List of seller applications with user details
     """
-    reqs = await seller_application_service.list_applications()
+    if (before_created_at is None) != (before_id is None):
+        raise BaseCustomException(status_code=400, error="Invalid cursor",
+                                  description="before_created_at and before_id must be given together")
+    cursor = (before_created_at, str(before_id)) if before_id is not None else None
+    reqs = await seller_application_service.list_applications(limit=limit, cursor=cursor)
     return reqs
 
 
@@ -75,22 +93,22 @@ async def list_seller_applications(
     summary="Review a seller application",
 )
 async def review_seller_request(
-    application_id: int,
+    application_id: UUID,
     review: SellerApplicationReview,
     seller_application_service: SellerApplicationService = Depends(
         get_seller_application_service),
-    admin_user: User = Depends(require_role(UserRole.ADMIN)),
+    admin_user: CurrentUser = Depends(require_role(UserRole.ADMIN)),
 ) -> SellerApplicationResponse:
     """Submit a review for a seller application. Only admins can access this endpoint. Approving an application promotes the user to SELLER role, while rejecting keeps them as BUYER.
 
     Args:
-        application_id (int): Application ID to review
+        application_id (UUID): Application ID to review
         review (SellerApplicationReview): Review details including status and admin notes
         seller_application_service (SellerApplicationService, optional): SellerApplicationService dependency. Defaults to Depends( get_seller_application_service).
-        admin_user (User, optional): Admin user details. Defaults to Depends(require_role(UserRole.ADMIN)).
+        admin_user (CurrentUser, optional): Admin user details. Defaults to Depends(require_role(UserRole.ADMIN)).
 
     Returns:
         SellerApplicationResponse: _description_
     """
-    application = await seller_application_service.review_application(application_id, admin_user.id, review)
+    application = await seller_application_service.review_application(str(application_id), admin_user.id, review)
     return application
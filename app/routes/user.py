@@ -3,7 +3,8 @@ User Routes
 
 Provides endpoints for user management, authentication, and profiles.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import logging
@@ -15,6 +16,7 @@ from schema.user import UserCreate, UserResponse, UserRole
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
+    default_response_class=ORJSONResponse,
     prefix="/users",
     tags=["users"],
     responses={
@@ -25,7 +27,7 @@ router = APIRouter(
 
 
 @router.post(
-    "register",
+    "/register",
     status_code=status.HTTP_201_CREATED,
     summary="Create user",
     description="Create a new user account",
@@ -51,16 +53,20 @@ async def register(user: UserCreate, user_service: UserService = Depends(get_use
 @router.delete(
     "",
     status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     summary="Delete user",
     description="Delete a user account"
 )
-async def delete_user(user_id: str = Depends(get_current_user_id), user_service: UserService = Depends(get_user_service)) -> None:
+async def delete_user(user_id: str = Depends(get_current_user_id), user_service: UserService = Depends(get_user_service)) -> Response:
     """
     Delete a user account.
 
     Args:
         user_id: The ID of the user to delete
         user_service: UserService dependency
+
+    Returns:
+        Response: Empty response
     """
     await user_service.soft_delete_user(user_id)
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
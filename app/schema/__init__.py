@@ -6,17 +6,19 @@ This package contains Pydantic schemas for request/response validation.
 
 from typing import List
 
-from .auth import UserLogin, TokenResponse, TokenData
-from .base import BaseSchema
+from .auth import UserLogin, TokenResponse, TokenData, CurrentUser
+from .base import BaseSchema, EmailStr
 from .profile import ProfileUpdate, ProfileResponse, ProfilePictureResponse, ProfileUpdateResponse
 from .user import UserCreate, UserUpdate, UserResponse
 from .seller_application import SellerApplicationStatus, SellerApplicationShow, SellerApplicationCreate, SellerApplicationResponse, SellerApplicationReview
 
 __all__: List[str] = [
     "BaseSchema",
+    "EmailStr",
     "UserLogin",
     "TokenResponse",
     "TokenData",
+    "CurrentUser",
     "UserCreate",
     "UserUpdate",
     "UserResponse",
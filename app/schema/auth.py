@@ -1,7 +1,8 @@
 """Authorization and Authentication Schemas."""
 
-from pydantic import EmailStr, Field
-from schema.base import BaseSchema
+from pydantic import Field
+from models import UserRole
+from schema.base import BaseSchema, EmailStr
 
 class UserLogin(BaseSchema):
     """
@@ -21,9 +22,11 @@ class TokenResponse(BaseSchema):
     Attributes:
         access_token: JWT access token
         token_type: Type of the token (e.g., Bearer)
+        expires_in: Lifetime of the access token, in seconds
     """
     access_token: str = Field(description="JWT access token")
     token_type: str = Field(default="bearer", description="Type of the token")
+    expires_in: int | None = Field(default=None, description="Lifetime of the access token, in seconds")
 
 class TokenData(BaseSchema):
     """
@@ -33,4 +36,22 @@ class TokenData(BaseSchema):
         email: User email address
         user_id: Unique identifier for the user
     """
-    user_id: str = Field(description="Unique identifier for the user")
\ No newline at end of file
+    user_id: str = Field(description="Unique identifier for the user")
+
+
+class CurrentUser(BaseSchema):
+    """
+    Authenticated user, built from the access token claims without a database lookup.
+
+    Attributes:
+        id: Unique identifier for the user
+        role: User role at the time the token was issued
+        jti: Unique identifier of the access token
+        iat: Access token issue time (Unix timestamp)
+        exp: Access token expiration (Unix timestamp)
+    """
+    id: str = Field(description="Unique identifier for the user")
+    role: UserRole = Field(description="User role")
+    jti: str = Field(description="Unique identifier of the access token")
+    iat: int = Field(description="Access token issue time (Unix timestamp)")
+    exp: int = Field(description="Access token expiration (Unix timestamp)")
@@ -1,5 +1,23 @@
-from pydantic import BaseModel, ConfigDict
+import re
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, ConfigDict
+
+# Compiled once at import; a cheap structural check instead of email-validator's full parse
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def _validate_email(value: str) -> str:
+    if len(value) > 254 or _EMAIL_RE.fullmatch(value) is None:
+        raise ValueError("value is not a valid email address")
+    # Domains are case-insensitive; normalize them like email-validator did
+    local, domain = value.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
+
+
+EmailStr = Annotated[str, AfterValidator(_validate_email)]
+
 
 class BaseSchema(BaseModel):
     """Base schema with common configurations."""
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -26,7 +26,7 @@ class ProfilePictureResponse(BaseSchema):
 
 class ProfileResponse(BaseSchema):
     """Full profile response."""
-    username: str
+    username: str = Field(validation_alias="slug")
     full_name: Optional[str] = None
     phone: Optional[str] = None
     city: Optional[str] = None
@@ -4,11 +4,24 @@ User Pydantic Schemas
 Request/response validation models for user authentication and management.
 """
 
-from pydantic import EmailStr, Field
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, Field, PlainSerializer
 from datetime import datetime
 from models import UserRole
 
-from schema.base import BaseSchema
+from schema.base import BaseSchema, EmailStr
+
+
+def _parse_role(value: Any) -> Any:
+    # Roles are exchanged by name ("admin", "seller", "buyer"), but stored as integers
+    if isinstance(value, str) and value.upper() in UserRole.__members__:
+        return UserRole[value.upper()]
+    return value
+
+
+RoleName = Annotated[UserRole, BeforeValidator(_parse_role),
+                     PlainSerializer(lambda role: role.name.lower(), return_type=str)]
 
 
 class UserCreate(BaseSchema):
@@ -37,9 +50,9 @@ class UserResponse(BaseSchema):
 
     Never includes password_hash in responses.
     """
-    id: int
+    id: str
     email: str
-    role: UserRole
+    role: RoleName
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -52,7 +65,7 @@ class UserUpdate(BaseSchema):
     All fields optional - only provided fields will be updated.
     """
     email: EmailStr | None = Field(None, description="New email address")
-    role: UserRole | None = Field(
+    role: RoleName | None = Field(
         None, description="New user role (admin only)")
     is_active: bool | None = Field(
         None, description="Account active status (admin only)")
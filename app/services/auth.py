@@ -5,17 +5,21 @@ It interacts with the database using SQLAlchemy's AsyncSession and handles busin
 """
 
 import logging
+import secrets
+import time
+from typing import Optional
 from fastapi import Response
-from jose import JWTError, jwt
+from jwt import InvalidTokenError
 from redis.asyncio import Redis
 
-from core.security import create_access_token, create_refresh_token, verify_password
+from core.security import create_access_token, create_refresh_token, ahash_password, averify_password, password_needs_rehash, decode_token, evict_cached_token, hash_token, refresh_token_key
 from core.exceptions import BaseCustomException
-from core.redis import cache_get, cache_set, cache_delete
+from core.redis import cache_pipeline
+from core.revocation import queue_token_revocation
 from core.config import settings
 from services.user import UserService
-from schema.auth import UserLogin
-from models import User
+from schema.auth import CurrentUser, UserLogin
+from models import User, UserRole
 
 logger = logging.getLogger(__name__)
 
@@ -32,14 +36,15 @@ class AuthService:
         self.user_service = user_service
         self.redis_client = redis_client
 
-    async def authenticate(self, login_data: UserLogin) -> User:
+    async def authenticate(self, login_data: UserLogin, client_ip: str) -> User:
         """Authenticates a user's login credentials.
 
         Args:
-            email (str): User's email address
-            password (str): User's plaintext password
+            login_data (UserLogin): User's email address and plaintext password
+            client_ip (str): Address of the client attempting the login
 
         Raises:
+            BaseCustomException: If too many login attempts failed for the email.
             BaseCustomException: If the email is not found.
             BaseCustomException: If the account is inactive.
             BaseCustomException: If the password is incorrect.
@@ -47,46 +52,101 @@ class AuthService:
         Returns:
             User: The authenticated user object.
         """
+        await self._check_login_attempts(login_data.email, client_ip)
+
         user = await self.user_service.get_user_by_email(login_data.email)
 
         if not user:
             logger.warning(
-                f"Login attempt with non-existent email: {login_data.email}")
+                "Login attempt with non-existent email: %s", login_data.email)
+            await self._count_failed_login(login_data.email, client_ip)
             raise BaseCustomException(status_code=401, error="Invalid email or password",
                                       description="The email or password is incorrect.")
         if not user.is_active:
             logger.warning(
-                f"Login attempt on inactive account: {login_data.email}")
+                "Login attempt on inactive account: %s", login_data.email)
             raise BaseCustomException(status_code=401, error="Inactive account",
                                       description="The account is inactive. Please contact support.")
 
-        if not verify_password(login_data.password, user.password_hash):
+        if not await averify_password(login_data.password, user.password_hash):
             logger.warning(
-                f"Failed password verification for user: {login_data.email}")
+                "Failed password verification for user: %s", login_data.email)
+            await self._count_failed_login(login_data.email, client_ip)
             raise BaseCustomException(status_code=401, error="Invalid email or password",
                                       description="The email or password is incorrect.")
 
-        logger.info(f"User authenticated: {login_data.email}")
+        if password_needs_rehash(user.password_hash):
+            # Transparently migrate legacy bcrypt (or outdated Argon2) hashes
+            await self.user_service.set_password_hash(user, await ahash_password(login_data.password))
+
+        await self.redis_client.delete(*self._login_attempts_keys(login_data.email, client_ip))
+        logger.info("User authenticated: %s", login_data.email)
         return user
 
-    async def refresh_token(self, response: Response, user_id: str) -> str:
+    @staticmethod
+    def _login_attempts_keys(email: str, client_ip: str) -> tuple[str, str]:
+        """Gets the failed login counter keys: per email and client address, and per email."""
+        return f"login_attempts:{email}:{client_ip}", f"login_attempts:{email}"
+
+    async def _check_login_attempts(self, email: str, client_ip: str) -> None:
+        """Rejects a login attempt if too many earlier attempts failed, without counting it.
+
+        The check runs before the password is verified, so a credential stuffing run
+        is cut off without spending a password hash per attempt. The main limit is
+        per email and client address, so guessing a user's password from elsewhere
+        does not lock them out; a much higher per-email ceiling still caps attacks
+        spread over many addresses.
+
+        Args:
+            email (str): Email address the login attempt is for
+            client_ip (str): Address of the client attempting the login
+
+        Raises:
+            BaseCustomException: If too many attempts failed within the lockout window.
+        """
+        client_failures, email_failures = await self.redis_client.mget(
+            self._login_attempts_keys(email, client_ip))
+        if int(client_failures or 0) >= settings.LOGIN_MAX_FAILED_ATTEMPTS \
+                or int(email_failures or 0) >= settings.LOGIN_MAX_FAILED_ATTEMPTS_PER_EMAIL:
+            logger.warning("Login attempt rejected after too many failures: %s", email)
+            raise BaseCustomException(status_code=429, error="Too many login attempts",
+                                      description="Too many failed login attempts. Please try again later.")
+
+    async def _count_failed_login(self, email: str, client_ip: str) -> None:
+        """Counts a failed login attempt. Each window starts at its first failure.
+
+        Args:
+            email (str): Email address the login attempt was for
+            client_ip (str): Address of the client that attempted the login
+        """
+        async with cache_pipeline(self.redis_client) as pipe:
+            for key in self._login_attempts_keys(email, client_ip):
+                pipe.incr(key)
+                pipe.expire(key, settings.LOGIN_LOCKOUT_SECONDS, nx=True)
+            await pipe.execute()
+
+    async def refresh_token(self, response: Response, user_id: str, role: UserRole) -> str:
         """Refreshes both the access token and the refresh token.
 
+        The refresh token ID is stored in Redis under its own key, expiring with the
+        token, so a user can hold several sessions, each one can be revoked
+        individually, and all of them can be revoked at once.
+
         Args:
             response (Response): The FastAPI response object to set cookies on.
-            user_id (str): The ID of the user whose tokens are being refreshed.
+            user_id (str): ID of the user whose tokens are being refreshed.
+            role (UserRole): Current role of the user.
 
         Returns:
             str: The new access token.
         """
-
         # Generate token
-        access_token = create_access_token(
-            user_id, settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        refresh_token = create_refresh_token(
-            user_id, settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        # Store refresh token in redis cache
-        await cache_set(self.redis_client, f"refresh_token:{user_id}", refresh_token, expire=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60)
+        refresh_jti = secrets.token_hex(16)
+        access_token = create_access_token(user_id, role)
+        refresh_token = create_refresh_token(user_id, refresh_jti, role)
+        # Store refresh token ID in redis cache
+        await self.redis_client.set(refresh_token_key(user_id, refresh_jti), b"1",
+                                    ex=settings.REFRESH_TOKEN_EXPIRE_SECONDS)
 
         # Send refresh token as HttpOnly cookie
         response.set_cookie(
@@ -95,8 +155,13 @@ class AuthService:
             httponly=True)
         return access_token
 
-    async def validate_refresh_token(self, token: str) -> str:
-        """Validates a refresh token.
+    async def validate_refresh_token(self, token: str) -> tuple[str, UserRole]:
+        """Validates a refresh token and consumes it.
+
+        Refresh tokens are single use: the stored entry is deleted as it is read,
+        so a replayed (e.g. stolen) refresh token is rejected. Deactivating a user
+        or changing their role deletes all of their entries, so Redis is the only
+        check needed and the database is not queried.
 
         Args:
             token (str): The refresh token to validate.
@@ -108,15 +173,11 @@ class AuthService:
             BaseCustomException: If the refresh token is revoked or expired.
 
         Returns:
-            str: The user ID extracted from the token claims.
+            tuple[str, UserRole]: ID and role of the user the refresh token was issued to.
         """
         try:
             # 1. Decode and verify signature
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY.get_secret_value(),
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = decode_token(token)
 
             # 2. Check token type claim
             if payload.get("type") != "refresh":
@@ -124,42 +185,55 @@ class AuthService:
                     status_code=401, error="Invalid token type", description="The refresh token is invalid.")
 
             user_id = payload.get("sub")
-            if not user_id:
+            jti = payload.get("jti")
+            if not user_id or not jti or "role" not in payload:
                 raise BaseCustomException(
                     status_code=401, error="Invalid token claims", description="The refresh token claims are invalid.")
 
-            # 3. Check Redis Whitelist
-            # This ensures the token hasn't been revoked/logged out
-            stored_token = await cache_get(self.redis_client, f"refresh_token:{user_id}")
-            if stored_token != token:
+            # 3. Check Redis Whitelist, which ensures the token hasn't been revoked/logged out,
+            # already used, or outlived a deactivation or role change
+            if not await self.redis_client.delete(refresh_token_key(user_id, jti)):
                 raise BaseCustomException(status_code=401, error="Token revoked or expired",
                                           description="The refresh token has been revoked or expired.")
 
-            # Making sure the user exists in the database
-            _ = await self.user_service.get_user_by_id(user_id)
-
-            return user_id
+            return user_id, UserRole(payload["role"])
 
-        except JWTError:
+        except InvalidTokenError:
             # Handles expired tokens or tampered signatures
             raise BaseCustomException(
                 status_code=401, error="Token expired", description="The refresh token has expired.")
 
-    async def logout(self, response: Response, user_id: str) -> None:
-        """Logs user out by deleting the refresh token from the cache and cookie.
+    async def logout(self, response: Response, current_user: CurrentUser, access_token: str, refresh_token: Optional[str]) -> None:
+        """Logs user out by deleting the refresh token from the cache and cookie, and revoking the access token.
 
         Args:
             response (Response): Response object to delete the cookie
-            user_id (str): User id to logout
-
-        Raises:
-            BaseCustomException: If refresh token is not found in cache
+            current_user (CurrentUser): Authenticated user to logout
+            access_token (str): Access token used for the logout request
+            refresh_token (Optional[str]): Refresh token cookie sent with the logout request. Clients that
+                keep the refresh token themselves may not send it; the access token is still revoked.
         """
-        logger.info(f"Logging out user {user_id}")
+        user_id = current_user.id
+        logger.info("Logging out user %s", user_id)
         response.delete_cookie(
             key="refresh_token", httponly=True, secure=True, samesite="strict", path="/")
-        deleted = await cache_delete(self.redis_client, f"refresh_token:{user_id}")
-        if deleted == 0:
-            logger.warning(f"No refresh token for {user_id} in cache")
-            raise BaseCustomException(status_code=401, error="Token not found",
-                                      description="Refresh token for the given user id was not found")
+        evict_cached_token(hash_token(access_token))
+        refresh_jti = None
+        if refresh_token:
+            try:
+                payload = decode_token(refresh_token)
+                if payload.get("type") == "refresh" and payload.get("sub") == user_id:
+                    refresh_jti = payload.get("jti")
+            except InvalidTokenError:
+                pass
+
+        # Refresh token deletion and access token revocation go out in a single round trip
+        async with cache_pipeline(self.redis_client) as pipe:
+            if refresh_jti:
+                pipe.delete(refresh_token_key(user_id, refresh_jti))
+            if current_user.exp > time.time():
+                queue_token_revocation(pipe, current_user.jti, current_user.exp)
+            results = await pipe.execute()
+        # The access token is revoked by now, so an unknown refresh token does not fail the logout
+        if refresh_jti and not results[0]:
+            logger.warning("Refresh token for %s was already revoked or used", user_id)
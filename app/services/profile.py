@@ -3,17 +3,17 @@
 Handles profile updates and secure image upload/storage.
 """
 
+import asyncio
 import logging
 from uuid import UUID
 
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from core.exceptions import BaseCustomException
 
 from .storage import StorageService
-from schema.profile import ProfileUpdate, ProfileUpdateResponse, ProfilePictureResponse
+from schema.profile import ProfileUpdate, ProfileResponse, ProfileUpdateResponse, ProfilePictureResponse
 from models import Profile
 
 
@@ -42,39 +42,92 @@ class ProfileService:
         Returns:
             ProfileUpdateResponse: The updated profile information.
         """
-        stmt = select(Profile).where(Profile.user_id == user_id)
-        result = await self.session.scalars(stmt)
-        profile = result.first()
+        profile = await self.session.get(Profile, user_id)
 
         if not profile:
-            raise BaseCustomException(status_code=404, detail="Profile not found",
-                                      message=f"Profile not found for user_id: {user_id}")
+            raise BaseCustomException(status_code=404, error="Profile not found",
+                                      description=f"Profile not found for user_id: {user_id}")
 
         update_dict = profile_update.model_dump(
             exclude_unset=True, exclude_none=True)
 
         if not update_dict:
-            raise BaseCustomException(status_code=400, detail="No valid fields to update",
-                                      message="At least one field must be provided for update")
+            raise BaseCustomException(status_code=400, error="No valid fields to update",
+                                      description="At least one field must be provided for update")
         for key, value in update_dict.items():
             setattr(profile, key, value)
 
-        self.session.add(profile)
+        # The profile is already attached, and the session does not expire on commit;
+        # only updated_at is set by the database and needs reloading
         await self.session.commit()
-        await self.session.refresh(profile)
-        return ProfileUpdateResponse(profile)
+        await self.session.refresh(profile, attribute_names=["updated_at"])
+        return ProfileUpdateResponse(profile=ProfileResponse.model_validate(profile), image_upload="skipped")
 
     async def upload_picture(self, picture: UploadFile, user_id: UUID) -> ProfilePictureResponse:
-        stmt = select(Profile).where(Profile.user_id == user_id)
-        result = await self.session.scalars(stmt)
-        profile = result.first()
-        if profile.picture_filename:
-            self.storage_service.delete_file(profile.picture_filename)
-        picture_mime, picture_name = await self.storage_service.upload_image(picture, self.storage_service.bucket_name)
+        """Uploads a new profile picture, replacing the previous one.
 
+        Args:
+            picture (UploadFile): The uploaded image file.
+            user_id (UUID): The ID of the user whose picture is being replaced.
+
+        Raises:
+            BaseCustomException: If the profile is not found.
+
+        Returns:
+            ProfilePictureResponse: The URL of the new picture.
+        """
+        # The upload does not depend on the profile row, so it starts while the row is loaded
+        upload = asyncio.create_task(self.storage_service.upload_image(picture))
+        try:
+            profile = await self.session.get(Profile, user_id)
+            # End the read transaction, so the pooled connection is not held through the malware
+            # scan and upload; sessions do not expire on commit, so the profile stays loaded
+            await self.session.commit()
+        except BaseException:
+            # Cancelling the task would not stop the upload already running on its worker thread
+            await self._discard_upload(upload)
+            raise
+        picture_mime, picture_name = await upload
+
+        if not profile:
+            await self.storage_service.delete_file(picture_name)
+            raise BaseCustomException(status_code=404, error="Profile not found",
+                                      description=f"Profile not found for user_id: {user_id}")
+
+        old_picture = profile.picture_filename
         profile.picture_filename = picture_name
         profile.picture_mime = picture_mime
 
-        await self.session.commit()
+        try:
+            await self.session.commit()
+        except BaseException:
+            await self._discard_upload(upload)
+            raise
+
+        # Only removed once the new picture is committed, so a failure never leaves the profile without one
+        if old_picture:
+            try:
+                await self.storage_service.delete_file(old_picture)
+            except BaseCustomException:
+                logger.warning("Previous profile picture %s was already gone", old_picture)
+            except Exception:
+                # Best effort: the new picture is already committed, so the request still succeeds
+                logger.exception("Failed to delete previous profile picture %s", old_picture)
+
+        return ProfilePictureResponse(picture_url=self.storage_service.get_presigned_url(picture_name))
 
-        return ProfilePictureResponse(self.storage_service.get_presigned_url(picture_name))
+    async def _discard_upload(self, upload: asyncio.Task) -> None:
+        """Waits for an upload that is no longer needed to finish, then deletes the stored picture.
+
+        Args:
+            upload (asyncio.Task): Task running StorageService.upload_image
+        """
+        try:
+            _, picture_name = await upload
+        except Exception:
+            # The upload failed itself, so nothing was stored
+            return
+        try:
+            await self.storage_service.delete_file(picture_name)
+        except Exception as e:
+            logger.error("Failed to delete discarded profile picture %s: %s", picture_name, e)
@@ -4,13 +4,13 @@ This module provides the SellerApplicationService class that encapsulates all op
 """
 
 import logging
-from sqlalchemy import select
+from sqlalchemy import exists, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 from typing import Sequence
 
 from models import UserRole
-from schema.seller_application import SellerApplicationStatus, SellerApplicationCreate, SellerApplicationResponse, SellerApplicationReview
+from schema.seller_application import SellerApplicationStatus, SellerApplicationCreate, SellerApplicationReview
 from models.seller_application import SellerApplication
 from services.user import UserService
 from core.exceptions import BaseCustomException
@@ -23,13 +23,12 @@ class SellerApplicationService:
         self.user_service = user_service
         self.session = session
 
-    async def create_application(self, request: SellerApplicationCreate) -> SellerApplicationResponse:
+    async def create_application(self, user_id: str, data: SellerApplicationCreate) -> SellerApplication:
         """Creates a new seller application.
 
         Args:
-            user_id (int): ID of the user applying for seller role
-            details (str | None): Short justification for the application
-            db (AsyncSession): Database session
+            user_id (str): ID of the user applying for seller role
+            data (SellerApplicationCreate): Validated request body, with a short justification for the application
 
         Raises:
             BaseCustomException: If user already has a pending application
@@ -37,73 +36,73 @@ class SellerApplicationService:
         Returns:
             SellerApplication: The newly created seller application
         """
-        stmt = select(SellerApplication).where(SellerApplication.user_id ==
-                                               request.user_id, SellerApplication.status == SellerApplicationStatus.PENDING)
-        result = await self.session.scalars(stmt)
-        existing = result.first()
+        stmt = select(exists().where(SellerApplication.user_id ==
+                                     user_id, SellerApplication.status == SellerApplicationStatus.PENDING))
 
-        if existing:
+        if await self.session.scalar(stmt):
             logger.warning(
-                f"User {request.user_id} attempted to create duplicate pending seller application")
+                "User %s attempted to create duplicate pending seller application", user_id)
             raise BaseCustomException(status_code=400, error="Duplicate application",
                                       description="There is already a pending seller application for this user")
 
         req = SellerApplication(
-            user_id=request.user_id,
-            details=request.details,
+            user_id=user_id,
+            details=data.details,
             status=SellerApplicationStatus.PENDING,
         )
         self.session.add(req)
         await self.session.commit()
         await self.session.refresh(req)
         logger.info(
-            f"Seller application created: {req.id} by user {request.user_id}")
+            "Seller application created: %s by user %s", req.id, user_id)
         return req
 
-    async def list_applications(self, limit: int | None = None, offset: int | None = None) -> Sequence[SellerApplication]:
-        """Lists all pending applications, with pagination.
+    async def list_applications(self,
+                                limit: int = 50,
+                                cursor: tuple[datetime, str] | None = None
+                                ) -> Sequence[SellerApplication]:
+        """Lists pending applications, newest first, with keyset pagination.
 
         Args:
-            limit (int | None, optional): Maximum number of applications to return. Defaults to None.
-            offset (int | None, optional): Number of applications to skip. Defaults to None.
+            limit (int, optional): Maximum number of applications to return. Defaults to 50.
+            cursor (tuple[datetime, str] | None, optional): Creation time and ID of the last application of the previous page. Defaults to None, for the first page.
 
         Returns:
             Sequence[SellerApplication]: The list of seller applications
         """
-        stmt = select(SellerApplication).where(SellerApplication.status == SellerApplicationStatus.PENDING).order_by(
-            SellerApplication.created_at.desc())
-        if limit is not None:
-            stmt = stmt.limit(limit)
-        if offset is not None:
-            stmt = stmt.offset(offset)
+        stmt = select(SellerApplication).where(
+            SellerApplication.status == SellerApplicationStatus.PENDING)
+        if cursor is not None:
+            # Seeks straight to the page on the (status, created_at, id) index instead of scanning skipped rows
+            stmt = stmt.where(
+                tuple_(SellerApplication.created_at, SellerApplication.id) < cursor)
+        stmt = stmt.order_by(SellerApplication.created_at.desc(),
+                             SellerApplication.id.desc()).limit(limit)
         result = await self.session.scalars(stmt)
         return result.all()
 
-    async def get_application_by_id(self, application_id: int) -> SellerApplication:
+    async def get_application_by_id(self, application_id: str) -> SellerApplication:
         """Gets an application by its ID.
 
         Args:
-            application_id (int): ID of the application to retrieve
+            application_id (str): ID of the application to retrieve
 
         Returns:
             SellerApplication: The retrieved seller application
         """
-        stmt = select(SellerApplication).where(
-            SellerApplication.id == application_id)
-        result = await self.session.scalars(stmt)
-        return result.first()
+        return await self.session.get(SellerApplication, application_id)
 
     async def review_application(self,
-                                 application_id: int,
-                                 reviewer_id: int,
+                                 application_id: str,
+                                 reviewer_id: str,
                                  review: SellerApplicationReview
                                  ) -> SellerApplication:
         """Updates a pending seller application, either approving or rejecting it.
 
         Args:
-            application_id (int): ID of the application to review
+            application_id (str): ID of the application to review
             approve (bool): Whether to approve or reject the application
-            reviewer_id (int): ID of the user reviewing the application
+            reviewer_id (str): ID of the user reviewing the application
             admin_notes (str | None): Notes from the reviewer
             db (AsyncSession): Database session
         Raises:
@@ -118,10 +117,7 @@ class SellerApplicationService:
             raise BaseCustomException(status_code=400, error="Invalid review status",
                                       description="Review status must be either 'approved' or 'rejected'")
 
-        stmt = select(SellerApplication).where(
-            SellerApplication.id == application_id)
-        result = await self.session.scalars(stmt)
-        req = result.first()
+        req = await self.session.get(SellerApplication, application_id)
         if not req:
             raise BaseCustomException(
                 status_code=404, error="Not found", description="Seller application not found")
@@ -135,11 +131,16 @@ class SellerApplicationService:
         req.reviewed_at = datetime.now(timezone.utc)
         req.status = SellerApplicationStatus.APPROVED if review.status == SellerApplicationStatus.APPROVED else SellerApplicationStatus.REJECTED
 
-        if review.status == SellerApplicationStatus.APPROVED:
-            _ = await self.user_service.update_user(req.user_id, role=UserRole.SELLER)
+        approved = review.status == SellerApplicationStatus.APPROVED
+        if approved:
+            # Flushed only, so the promotion and the review are committed together
+            _ = await self.user_service.update_user(req.user_id, role=UserRole.SELLER, commit=False)
 
         await self.session.commit()
+        if approved:
+            # Only once the promotion is committed, so a failed commit does not log the user out
+            await self.user_service.revoke_issued_tokens(req.user_id)
         await self.session.refresh(req)
         logger.info(
-            f"Seller application {application_id} reviewed by {reviewer_id}: {'approved' if review.status == SellerApplicationStatus.APPROVED else 'rejected'}")
+            "Seller application %s reviewed by %s: %s", application_id, reviewer_id, req.status.value)
         return req
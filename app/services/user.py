@@ -4,30 +4,42 @@ This module provides the UserService class that encapsulates all user-related op
 It interacts with the database using SQLAlchemy's AsyncSession and handles business logic related to users, including validation and error handling.
 """
 
+from functools import lru_cache
 import logging
-from psycopg2 import IntegrityError
 from sqlalchemy import select, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
 from slugify import slugify  # type: ignore
 import secrets
 
 from core.exceptions import BaseCustomException
+from core.revocation import revoke_user_tokens
 from models.user import User, UserRole, Profile
-from core.security import hash_password
+from core.security import ahash_password, refresh_token_key
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _slugify(full_name: str) -> str:
+    """Slugifies a full name; slugify is pure, so results for common names are reused."""
+    return slugify(full_name, separator="-", strict=True)
+
+
 class UserService:
     """Handles all user-related operations.
     This is the service responsible for creating, updating and managing user accounts.
 
     Attributes:
         session (AsyncSession): The database session for performing operations.
+        redis_client (Redis): A Redis client, used to deny access to deactivated users.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, redis_client: Redis):
         self.session = session
+        self.redis_client = redis_client
 
     async def register_user(self,
                             email: str,
@@ -48,40 +60,46 @@ class UserService:
             User: The newly created user object.
         """
 
-        stmt = select(exists()).where(User.email == email)
-        existing_user = await self.session.scalars(stmt)
-
-        if existing_user:
+        # scalar() returns the boolean itself; a ScalarResult object would always be truthy
+        stmt = select(exists().where(User.email == email))
+        if await self.session.scalar(stmt):
             logger.warning(
-                f"Registration attempt with existing email: {email}")
+                "Registration attempt with existing email: %s", email)
             raise BaseCustomException(status_code=409, error="Invalid e-mail",
                                       description="There is already an account with this e-mail address")
 
         user = User(email=email, role=UserRole.BUYER,
-                    password_hash=hash_password(password), is_active=True)
-        profile = Profile(user_id=user.id, full_name=full_name)
-        user.profile = profile
+                    password_hash=await ahash_password(password), is_active=True)
+        self.session.add(user)
+        try:
+            await self.session.flush()
+        except IntegrityError as exc:
+            # Lost a race with a concurrent registration for the same email
+            logger.warning(
+                "Failed to register user with email %s: %s", email, exc)
+            await self.session.rollback()
+            raise BaseCustomException(status_code=409, error="Invalid e-mail",
+                                      description="There is already an account with this e-mail address")
 
-        MAX_ATTEMPTS = 5
+        # Generate username from full name. With 64 random bits a collision is
+        # practically impossible, so a single retry is enough; ON CONFLICT keeps a
+        # collision from aborting the transaction.
+        username = _slugify(full_name)
+        MAX_ATTEMPTS = 2
         for _ in range(MAX_ATTEMPTS):
-            # Generate username from full name
-            username = slugify(full_name, separator="-", strict=True)
-            suffix = secrets.token_hex(4)
-            profile.slug = f"{username}-{suffix}"
-
-            self.session.add(user)
-
-            try:
+            stmt = (
+                pg_insert(Profile)
+                .values(user_id=user.id, full_name=full_name, slug=f"{username}-{secrets.token_hex(8)}")
+                .on_conflict_do_nothing(index_elements=[Profile.slug])
+                .returning(Profile.user_id)
+            )
+            if await self.session.scalar(stmt) is not None:
                 await self.session.commit()
                 await self.session.refresh(user)
-                await self.session.refresh(profile)
-                logger.info(f"User registered: {email}")
+                logger.info("User registered: %s", email)
                 return user
-            except IntegrityError as exc:
-                logger.warning(
-                    f"Failed to register user with email {email}: {exc}")
-                await self.session.rollback()
-                continue
+
+        await self.session.rollback()
         raise BaseCustomException(status_code=500, error="Registration failed",
                                   description="Could not generate a unique username. Please try again.")
 
@@ -99,7 +117,7 @@ class UserService:
         """
         user = await self.session.get(User, user_id)
         if not user:
-            logger.warning(f"User not found: {user_id}")
+            logger.warning("User not found: %s", user_id)
             raise BaseCustomException(status_code=404, error="User not found",
                                       description="The user with the given ID was not found.")
         return user
@@ -110,6 +128,7 @@ class UserService:
         email: str | None = None,
         role: UserRole | None = None,
         is_active: bool | None = None,
+        commit: bool = True,
     ) -> User:
         """Updates a user
 
@@ -118,6 +137,7 @@ class UserService:
             email (str | None, optional): The new email address for the user. Defaults to None.
             role (UserRole | None, optional): The new role for the user. Defaults to None.
             is_active (bool | None, optional): The new active status for the user. Defaults to None.
+            commit (bool, optional): Commit the transaction. Pass False to only flush, so the caller can commit the update along with its own writes; the caller must then call revoke_issued_tokens after committing a deactivation or role change. Defaults to True.
 
         Raises:
             BaseCustomException: _description_
@@ -129,10 +149,8 @@ class UserService:
         user = await self.get_user_by_id(user_id)
 
         if email and email != user.email:
-            stmt = select(User).where(User.email == email)
-            result = await self.session.scalars(stmt)
-            existing = result.first()
-            if existing:
+            stmt = select(exists().where(User.email == email))
+            if await self.session.scalar(stmt):
                 raise BaseCustomException(
                     status_code=409, error="Email already in use", description="The email is already in use.")
             user.email = email
@@ -143,12 +161,30 @@ class UserService:
         if is_active is not None:
             user.is_active = is_active
 
+        if not commit:
+            await self.session.flush()
+            return user
+
         await self.session.commit()
         await self.session.refresh(user)
 
-        logger.info(f"User updated: {user_id}")
+        if is_active is False or role:
+            await self.revoke_issued_tokens(user_id)
+
+        logger.info("User updated: %s", user_id)
         return user
 
+    async def set_password_hash(self, user: User, password_hash: str) -> None:
+        """Replaces a user's stored password hash.
+
+        Args:
+            user (User): User whose hash is replaced
+            password_hash (str): New password hash
+        """
+        user.password_hash = password_hash
+        await self.session.commit()
+        logger.info("Password hash updated for user: %s", user.id)
+
     async def get_user_by_email(self, email: str) -> User | None:
         """Gets a user by their email address.
 
@@ -158,9 +194,8 @@ class UserService:
         Returns:
             User | None: The retrieved user object, or None if not found.
         """
-        stmt = select(User).where(User.email == email)
-        result = await self.session.scalars(stmt)
-        return result.first()
+        stmt = select(User).where(User.email == email).limit(1)
+        return await self.session.scalar(stmt)
 
     async def soft_delete_user(self, user_id: str) -> None:
         """Soft deletes a user by the giver user id
@@ -171,5 +206,22 @@ class UserService:
         user = await self.get_user_by_id(user_id)
         user.is_active = False
         await self.session.commit()
-        logger.info(f"User soft deleted: {user_id}")
+        await self.revoke_issued_tokens(user_id)
+        logger.info("User soft deleted: %s", user_id)
         return None
+
+    async def revoke_issued_tokens(self, user_id: str) -> None:
+        """Rejects every access and refresh token issued to the user until now.
+
+        Tokens embed the user's role and are trusted without a database lookup,
+        so they must be revoked whenever the account is deactivated or its role changes.
+
+        Args:
+            user_id (str): User whose tokens are revoked
+        """
+        await revoke_user_tokens(self.redis_client, user_id)
+        # Rare enough that scanning the keyspace is cheaper than maintaining a per-user index
+        keys = [key async for key in self.redis_client.scan_iter(
+            match=refresh_token_key(user_id, "*"), count=1000)]
+        if keys:
+            await self.redis_client.unlink(*keys)